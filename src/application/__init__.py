@@ -1,7 +1,23 @@
 """Application layer for user interfaces."""
 
-from .cli_interface import CLIInterface
-from .response_generator import QueryResponse, ResponseGenerator
-from .session_manager import SessionManager
+from importlib import import_module
+from typing import Any
 
 __all__ = ["CLIInterface", "ResponseGenerator", "QueryResponse", "SessionManager"]
+
+# Submodules are imported on first attribute access so that importing the
+# package (e.g. for the CLI entry point) does not load the LLM stack.
+_LAZY_ATTRS = {
+    "CLIInterface": ".cli_interface",
+    "ResponseGenerator": ".response_generator",
+    "QueryResponse": ".response_generator",
+    "SessionManager": ".session_manager",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_LAZY_ATTRS[name], __name__), name)
+    globals()[name] = value
+    return value
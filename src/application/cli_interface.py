@@ -1,17 +1,7 @@
-import asyncio
-from typing import Optional
+import time
 
 import click
 from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-
-from ..utils.config import Config
-from ..utils.logger import setup_logger
-from .response_generator import ResponseGenerator
-from .session_manager import SessionManager
 
 console = Console()
 
@@ -19,7 +9,15 @@ console = Console()
 class CLIInterface:
     """Command-line interface for the Report Portal LLM Query system."""
 
+    RENDER_INTERVAL = 0.1
+
     def __init__(self, config_path: str = "config/config.yaml"):
+        # Deferred so that `--help` and argument errors skip the Pydantic/LLM stack
+        from ..utils.config import Config
+        from ..utils.logger import setup_logger
+        from .response_generator import ResponseGenerator
+        from .session_manager import SessionManager
+
         self.config = Config.from_yaml(config_path)
         setup_logger(self.config)
         self.response_generator = ResponseGenerator(self.config)
@@ -28,6 +26,10 @@ class CLIInterface:
 
     async def start_interactive_session(self):
         """Start an interactive query session."""
+        from rich.live import Live
+        from rich.markdown import Markdown
+        from rich.panel import Panel
+
         console.print(
             Panel.fit(
                 "[bold blue]Report Portal LLM Query Interface[/bold blue]\n"
@@ -36,52 +38,58 @@ class CLIInterface:
             )
         )
 
-        self.session_id = self.session_manager.create_session()
-
-        while True:
-            try:
-                # Get user input
-                query = console.input("\n[bold green]Query>[/bold green] ")
-
-                if query.lower() in ["exit", "quit", "q"]:
+        try:
+            self.session_id = self.session_manager.create_session()
+
+            while True:
+                try:
+                    # Get user input
+                    query = console.input("\n[bold green]Query>[/bold green] ")
+
+                    if query.lower() in ["exit", "quit", "q"]:
+                        break
+
+                    if query.strip() == "":
+                        continue
+
+                    # Stream the response, re-parsing the markdown at most every
+                    # RENDER_INTERVAL seconds rather than on every chunk
+                    console.print("\n[bold cyan]Response:[/bold cyan]")
+                    chunks = []
+                    metadata = {}
+                    last_render = 0.0
+
+                    with Live(Markdown(""), console=console, refresh_per_second=10) as live:
+                        async for chunk in self.response_generator.generate_streaming_response(
+                            query, session_id=self.session_id, metadata=metadata
+                        ):
+                            chunks.append(chunk)
+                            now = time.monotonic()
+                            if now - last_render >= self.RENDER_INTERVAL:
+                                live.update(Markdown("".join(chunks)))
+                                last_render = now
+
+                        live.update(Markdown("".join(chunks)))
+
+                    self._display_metadata(metadata)
+
+                except KeyboardInterrupt:
+                    console.print("\n[yellow]Session interrupted[/yellow]")
                     break
+                except Exception as e:
+                    console.print(f"\n[red]Error: {str(e)}[/red]")
 
-                if query.strip() == "":
-                    continue
-
-                # Process query with progress indicator
-                with Progress(
-                    SpinnerColumn(),
-                    TextColumn("[progress.description]{task.description}"),
-                    console=console,
-                ) as progress:
-                    task = progress.add_task("Processing query...", total=None)
-
-                    response = await self.response_generator.generate_response(
-                        query, session_id=self.session_id
-                    )
-
-                    progress.update(task, completed=True)
-
-                # Display response
-                console.print("\n[bold cyan]Response:[/bold cyan]")
-                console.print(Markdown(response.answer))
-
-                # Display additional metadata if available
-                if response.metadata:
-                    self._display_metadata(response.metadata)
-
-            except KeyboardInterrupt:
-                console.print("\n[yellow]Session interrupted[/yellow]")
-                break
-            except Exception as e:
-                console.print(f"\n[red]Error: {str(e)}[/red]")
-
-        console.print("\n[blue]Thank you for using Report Portal LLM Query Interface![/blue]")
-        self.session_manager.close_session(self.session_id)
+            console.print("\n[blue]Thank you for using Report Portal LLM Query Interface![/blue]")
+            self.session_manager.close_session(self.session_id)
+        finally:
+            # Drains queued cache writes and closes the database and HTTP pool
+            # before asyncio.run() cancels the background writer
+            await self.response_generator.close()
 
     def _display_metadata(self, metadata: dict):
         """Display query metadata in a formatted table."""
+        from rich.table import Table
+
         if "statistics" in metadata:
             stats = metadata["statistics"]
             table = Table(title="Query Statistics", show_header=True)
@@ -95,6 +103,8 @@ class CLIInterface:
 
     async def single_query(self, query: str):
         """Execute a single query and return."""
+        from rich.markdown import Markdown
+
         try:
             response = await self.response_generator.generate_response(query)
             console.print(Markdown(response.answer))
@@ -102,6 +112,8 @@ class CLIInterface:
         except Exception as e:
             console.print(f"[red]Error: {str(e)}[/red]")
             raise
+        finally:
+            await self.response_generator.close()
 
 
 @click.group()
@@ -114,6 +126,8 @@ def cli():
 @click.option("--config", "-c", default="config/config.yaml", help="Path to configuration file")
 def interactive(config):
     """Start interactive query session."""
+    import asyncio
+
     interface = CLIInterface(config)
     asyncio.run(interface.start_interactive_session())
 
@@ -123,6 +137,8 @@ def interactive(config):
 @click.option("--config", "-c", default="config/config.yaml", help="Path to configuration file")
 def query(query, config):
     """Execute a single query."""
+    import asyncio
+
     interface = CLIInterface(config)
     asyncio.run(interface.single_query(query))
 
@@ -1,23 +1,35 @@
 import asyncio
-from datetime import datetime, timedelta
-from typing import AsyncGenerator, Optional
+import hashlib
+import itertools
+import logging
+import re
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from datetime import datetime
+from functools import cached_property
+from typing import TYPE_CHECKING, AsyncGenerator, Optional
 
-from loguru import logger
-from pydantic import BaseModel
-
-from ..data_access.cache_manager import CacheManager
 from ..data_access.data_normalizer import DataNormalizer
-from ..data_access.reportportal_client import ReportPortalClient
-from ..llm_integration.llm_interface import LLMInterface
-from ..llm_integration.prompt_engineer import PromptEngineer
 from ..llm_integration.query_processor import QueryProcessor
 from ..utils.config import Config
 
+if TYPE_CHECKING:
+    from ..data_access.cache_manager import CacheManager
+    from ..data_access.reportportal_client import ReportPortalClient
+    from ..llm_integration.llm_interface import LLMInterface
+    from ..llm_integration.prompt_engineer import PromptEngineer
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class QueryResponse:
+    """Internally produced response; a plain dataclass avoids validation overhead."""
 
-class QueryResponse(BaseModel):
     answer: str
     query_time: datetime
-    session_id: Optional[str]
+    session_id: Optional[str] = None
     metadata: Optional[dict] = None
 
 
@@ -26,37 +38,49 @@ class ResponseGenerator:
 
     def __init__(self, config: Config):
         self.config = config
-        self.rp_client = ReportPortalClient(config)
-        self.cache_manager = CacheManager(config)
         self.query_processor = QueryProcessor()
-        self.prompt_engineer = PromptEngineer(config)
-        self.llm_interface = LLMInterface(config)
         self.data_normalizer = DataNormalizer()
 
+    # Heavy components are imported and built on first use so that constructing
+    # the generator does not open HTTP pools or load the LLM stack up front.
+
+    @cached_property
+    def rp_client(self) -> "ReportPortalClient":
+        from ..data_access.reportportal_client import ReportPortalClient
+
+        return ReportPortalClient(self.config)
+
+    @cached_property
+    def cache_manager(self) -> "CacheManager":
+        from ..data_access.cache_manager import CacheManager
+
+        return CacheManager(self.config)
+
+    @cached_property
+    def prompt_engineer(self) -> "PromptEngineer":
+        from ..llm_integration.prompt_engineer import PromptEngineer
+
+        return PromptEngineer(self.config)
+
+    @cached_property
+    def llm_interface(self) -> "LLMInterface":
+        from ..llm_integration.llm_interface import LLMInterface
+
+        return LLMInterface(self.config)
+
     async def generate_response(
         self, query: str, session_id: Optional[str] = None
     ) -> QueryResponse:
         """Generate response for a user query."""
         start_time = datetime.now()
+        start_monotonic = time.monotonic()
 
         try:
             # Process the query
             query_intent = self.query_processor.process_query(query)
-            logger.info(f"Processed query: {query_intent.query_type.value}")
+            logger.info("Processed query: %s", query_intent.query_type.value)
 
-            # Check cache first
-            cache_key = f"query_{hash(query)}_{query_intent.filters.dict()}"
-            cached_data = self.cache_manager.get(cache_key)
-
-            if cached_data:
-                logger.info("Using cached data")
-                test_data = cached_data
-            else:
-                # Fetch data from Report Portal
-                test_data = await self._fetch_relevant_data(query_intent)
-
-                # Cache the results
-                self.cache_manager.set(cache_key, test_data, ttl_hours=1)
+            test_data = await self._get_test_data(query, query_intent)
 
             # Normalize data
             df = self.data_normalizer.normalize_test_executions(test_data)
@@ -70,7 +94,7 @@ class ResponseGenerator:
             answer = await self.llm_interface.generate_response(prompt)
 
             # Calculate response time
-            response_time = (datetime.now() - start_time).total_seconds()
+            response_time = time.monotonic() - start_monotonic
 
             return QueryResponse(
                 answer=answer,
@@ -85,7 +109,7 @@ class ResponseGenerator:
             )
 
         except Exception as e:
-            logger.error(f"Error generating response: {e}")
+            logger.error("Error generating response: %s", e)
             return QueryResponse(
                 answer=f"I encountered an error while processing your query: {str(e)}",
                 query_time=start_time,
@@ -94,19 +118,32 @@ class ResponseGenerator:
             )
 
     async def generate_streaming_response(
-        self, query: str, session_id: Optional[str] = None
+        self, query: str, session_id: Optional[str] = None, metadata: Optional[dict] = None
     ) -> AsyncGenerator[str, None]:
-        """Generate streaming response for real-time output."""
+        """Generate streaming response for real-time output.
+
+        If a metadata dict is passed, it is filled in before the first chunk is
+        yielded, with the same query type, data point and statistics entries
+        that generate_response returns.
+        """
         try:
             # Process query and fetch data (same as above)
             query_intent = self.query_processor.process_query(query)
-            test_data = await self._fetch_relevant_data(query_intent)
+            logger.info("Processed query: %s", query_intent.query_type.value)
+            test_data = await self._get_test_data(query, query_intent)
 
             # Prepare context
             df = self.data_normalizer.normalize_test_executions(test_data)
             summary_stats = self.data_normalizer.create_test_summary(df)
             context = self.data_normalizer.format_for_llm(df)
 
+            if metadata is not None:
+                metadata.update(
+                    query_type=query_intent.query_type.value,
+                    data_points=len(test_data),
+                    statistics=summary_stats,
+                )
+
             # Construct prompt
             prompt = self.prompt_engineer.construct_prompt(query_intent, context, summary_stats)
 
@@ -115,9 +152,32 @@ class ResponseGenerator:
                 yield chunk
 
         except Exception as e:
-            logger.error(f"Error in streaming response: {e}")
+            logger.error("Error in streaming response: %s", e)
             yield f"\nError: {str(e)}"
 
+    @staticmethod
+    def _generate_cache_key(query: str, filters) -> str:
+        """Generate a cache key that is stable across processes."""
+        canonical = repr((query, filters.fingerprint()))
+        digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=16)
+        return f"query_{digest.hexdigest()}"
+
+    async def _get_test_data(self, query: str, query_intent):
+        """Return test data for a query, from the cache when possible."""
+        cache_key = self._generate_cache_key(query, query_intent.filters)
+        cached_data = self.cache_manager.get(cache_key)
+
+        if cached_data:
+            logger.info("Using cached data")
+            return cached_data
+
+        # Fetch data from Report Portal
+        test_data = await self._fetch_relevant_data(query_intent)
+
+        # Cache the results without blocking on the database write
+        await self.cache_manager.aset(cache_key, test_data, ttl_hours=1)
+        return test_data
+
     async def _fetch_relevant_data(self, query_intent):
         """Fetch relevant test data based on query intent."""
         filters = query_intent.filters
@@ -126,9 +186,9 @@ class ResponseGenerator:
         rp_filters = {}
 
         if filters.time_filter:
-            # Convert days_back to timestamp
-            from_date = datetime.now() - timedelta(days=filters.time_filter.days_back)
-            rp_filters["filter.gte.startTime"] = int(from_date.timestamp() * 1000)
+            # Convert days_back to a millisecond epoch timestamp
+            from_seconds = time.time() - filters.time_filter.days_back * 86400
+            rp_filters["filter.gte.startTime"] = int(from_seconds * 1000)
 
         if filters.status and filters.status != "all":
             rp_filters["filter.eq.status"] = filters.status.upper()
@@ -136,25 +196,42 @@ class ResponseGenerator:
         if filters.platform:
             rp_filters["filter.has.attributes"] = f"platform:{filters.platform}"
 
-        # Fetch launches first
-        launches = await self.rp_client.get_launches(rp_filters, page_size=50)
-
-        # Fetch test items
-        all_test_items = []
-        for launch in launches[:10]:  # Limit to recent launches
-            items = await self.rp_client.get_test_items(launch.id)
-            all_test_items.extend(items)
-
-        # Filter by specific test names if provided
+        # Fetch the most recent launches, stopping once enough have arrived
+        # rather than paging through every matching launch
+        recent_launches = []
+        async with aclosing(self.rp_client.iter_launches(rp_filters, page_size=50)) as launches:
+            async for launch in launches:
+                recent_launches.append(launch)
+                if len(recent_launches) >= 10:
+                    break
+
+        # Fetch test items for those launches concurrently; the client bounds
+        # the number of requests in flight
+        results = await asyncio.gather(
+            *(self.rp_client.get_test_items(launch.id) for launch in recent_launches),
+            return_exceptions=True,
+        )
+
+        item_batches = []
+        for launch, result in zip(recent_launches, results):
+            if isinstance(result, BaseException):
+                logger.error("Error fetching test items for launch %s: %s", launch.id, result)
+                continue
+            item_batches.append(result)
+
+        all_test_items = itertools.chain.from_iterable(item_batches)
+
+        # Filter by specific test names if provided, scanning each name once
         if query_intent.test_names:
-            all_test_items = [
-                item
-                for item in all_test_items
-                if any(name in item.name for name in query_intent.test_names)
-            ]
+            name_pattern = re.compile("|".join(map(re.escape, query_intent.test_names)))
+            return [item for item in all_test_items if name_pattern.search(item.name)]
 
-        return all_test_items
+        return list(all_test_items)
 
     async def close(self):
         """Cleanup resources."""
-        await self.rp_client.close()
+        if "rp_client" in self.__dict__:
+            await self.rp_client.close()
+        if "cache_manager" in self.__dict__:
+            await self.cache_manager.flush()
+            self.cache_manager.close()
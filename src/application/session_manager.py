@@ -1,13 +1,21 @@
-import json
+import functools
+import logging
+import os
 import uuid
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Sequence
 
-from loguru import logger
+import orjson
 
 from ..utils.config import Config
 
+logger = logging.getLogger(__name__)
+
+# Metadata can carry numpy scalars and non-string keys from pandas summaries
+_ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
 
 class SessionManager:
     """Manage user sessions and conversation history."""
@@ -18,6 +26,8 @@ class SessionManager:
         self.session_dir = Path(config.paths.session_dir)
         self.session_dir.mkdir(parents=True, exist_ok=True)
         self.max_history_length = 50
+        # Keyed on (session_id, mtime) so that edits on disk invalidate entries
+        self._read_session_cached = functools.lru_cache(maxsize=128)(self._read_session)
 
     def create_session(self) -> str:
         """Create a new session."""
@@ -25,17 +35,21 @@ class SessionManager:
         self.sessions[session_id] = {
             "created_at": datetime.now(),
             "last_active": datetime.now(),
-            "history": [],
+            "history": deque(maxlen=self.max_history_length),
         }
-        logger.info(f"Created new session: {session_id}")
+        logger.info("Created new session: %s", session_id)
         return session_id
 
     def add_to_history(
-        self, session_id: str, query: str, response: str, metadata: Optional[dict] = None
+        self, session_id: Optional[str], query: str, response: str, metadata: Optional[dict] = None
     ):
         """Add query-response pair to session history."""
-        if session_id not in self.sessions:
-            logger.warning(f"Session {session_id} not found")
+        if not session_id:
+            return
+
+        session = self.sessions.get(session_id)
+        if session is None:
+            logger.warning("Session %s not found", session_id)
             return
 
         history_entry = {
@@ -45,21 +59,18 @@ class SessionManager:
             "metadata": metadata,
         }
 
-        session = self.sessions[session_id]
+        # The history deque is bounded, so old entries drop off on append
         session["history"].append(history_entry)
         session["last_active"] = datetime.now()
 
-        # Limit history length
-        if len(session["history"]) > self.max_history_length:
-            session["history"] = session["history"][-self.max_history_length :]
+        # Append only the new entry; the full snapshot is written on close
+        self._append_history_entry(session_id, history_entry)
 
-        # Persist to disk
-        self._save_session(session_id)
-
-    def get_session_history(self, session_id: str) -> Optional[List[Dict]]:
+    def get_session_history(self, session_id: str) -> Optional[Sequence[Dict]]:
         """Get history for a session."""
-        if session_id in self.sessions:
-            return self.sessions[session_id]["history"]
+        session = self.sessions.get(session_id)
+        if session is not None:
+            return session["history"]
 
         # Try loading from disk
         session = self._load_session(session_id)
@@ -75,7 +86,7 @@ class SessionManager:
         if not history:
             return ""
 
-        recent_history = history[-n_recent:]
+        recent_history = list(history)[-n_recent:]
         context_parts = []
 
         for entry in recent_history:
@@ -89,7 +100,7 @@ class SessionManager:
         if session_id in self.sessions:
             self._save_session(session_id)
             del self.sessions[session_id]
-            logger.info(f"Closed session: {session_id}")
+            logger.info("Closed session: %s", session_id)
 
     def cleanup_old_sessions(self, days: int = 7):
         """Remove sessions older than specified days."""
@@ -104,50 +115,106 @@ class SessionManager:
         for session_id in sessions_to_remove:
             del self.sessions[session_id]
 
-        # Clean disk sessions
-        for session_file in self.session_dir.glob("*.json"):
-            try:
-                if datetime.fromtimestamp(session_file.stat().st_mtime) < cutoff_date:
-                    session_file.unlink()
-            except Exception as e:
-                logger.error(f"Error cleaning up session file {session_file}: {e}")
+        # Clean disk sessions; DirEntry.stat() reuses data from the directory scan
+        cutoff_ts = cutoff_date.timestamp()
+        with os.scandir(self.session_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith((".json", ".jsonl")):
+                    continue
+                try:
+                    if entry.stat().st_mtime < cutoff_ts:
+                        os.unlink(entry.path)
+                except Exception as e:
+                    logger.error("Error cleaning up session file %s: %s", entry.path, e)
+
+        self._read_session_cached.cache_clear()
 
-        logger.info(f"Cleaned up {len(sessions_to_remove)} old sessions")
+        logger.info("Cleaned up %s old sessions", len(sessions_to_remove))
+
+    def _append_history_entry(self, session_id: str, history_entry: Dict):
+        """Append a single history entry to the session's JSONL log."""
+        history_file = self.session_dir / f"{session_id}.jsonl"
+
+        try:
+            with open(history_file, "ab") as f:
+                f.write(orjson.dumps(history_entry, option=_ORJSON_OPTIONS) + b"\n")
+        except Exception as e:
+            logger.error("Error appending to session %s: %s", session_id, e)
 
     def _save_session(self, session_id: str):
-        """Save session to disk."""
+        """Save session snapshot to disk, compacting the history log."""
         if session_id not in self.sessions:
             return
 
+        session = self.sessions[session_id]
         session_file = self.session_dir / f"{session_id}.json"
+        history_file = self.session_dir / f"{session_id}.jsonl"
 
-        # Convert datetime objects to strings
-        session_data = self.sessions[session_id].copy()
-        session_data["created_at"] = session_data["created_at"].isoformat()
-        session_data["last_active"] = session_data["last_active"].isoformat()
+        # orjson serializes datetime objects to ISO 8601 natively
+        session_data = {
+            "created_at": session["created_at"],
+            "last_active": session["last_active"],
+        }
 
         try:
-            with open(session_file, "w") as f:
-                json.dump(session_data, f, indent=2)
+            with open(session_file, "wb") as f:
+                f.write(orjson.dumps(session_data, option=_ORJSON_OPTIONS))
+            with open(history_file, "wb") as f:
+                f.writelines(
+                    orjson.dumps(entry, option=_ORJSON_OPTIONS) + b"\n"
+                    for entry in session["history"]
+                )
         except Exception as e:
-            logger.error(f"Error saving session {session_id}: {e}")
+            logger.error("Error saving session %s: %s", session_id, e)
 
     def _load_session(self, session_id: str) -> Optional[Dict]:
-        """Load session from disk."""
-        session_file = self.session_dir / f"{session_id}.json"
+        """Load session from disk, reusing the parsed result while files are unchanged."""
+        mtime = None
+        for suffix in (".json", ".jsonl"):
+            try:
+                st_mtime = os.stat(self.session_dir / f"{session_id}{suffix}").st_mtime_ns
+            except OSError:
+                continue
+            mtime = max(mtime or 0, st_mtime)
 
-        if not session_file.exists():
+        if mtime is None:
             return None
 
-        try:
-            with open(session_file, "r") as f:
-                session_data = json.load(f)
+        return self._read_session_cached(session_id, mtime)
 
-            # Convert strings back to datetime objects
-            session_data["created_at"] = datetime.fromisoformat(session_data["created_at"])
-            session_data["last_active"] = datetime.fromisoformat(session_data["last_active"])
+    def _read_session(self, session_id: str, mtime: int) -> Optional[Dict]:
+        """Read and parse session files from disk."""
+        session_file = self.session_dir / f"{session_id}.json"
+        history_file = self.session_dir / f"{session_id}.jsonl"
 
-            return session_data
+        try:
+            session_data = {}
+            if session_file.exists():
+                with open(session_file, "rb") as f:
+                    session_data = orjson.loads(f.read())
+
+            # Sessions saved before the JSONL log kept history inline
+            history = session_data.get("history", [])
+            if history_file.exists():
+                with open(history_file, "rb") as f:
+                    history.extend(orjson.loads(line) for line in f if line.strip())
+            history = deque(history, maxlen=self.max_history_length)
+
+            # Convert strings back to datetime objects; entries appended after
+            # the last snapshot may be newer than the stored last_active
+            timestamps = [session_data.get("created_at"), session_data.get("last_active")]
+            if history:
+                timestamps += [history[0]["timestamp"], history[-1]["timestamp"]]
+            parsed = [datetime.fromisoformat(ts) for ts in timestamps if ts]
+            if not parsed:
+                return None
+
+            created_at = session_data.get("created_at")
+            return {
+                "created_at": datetime.fromisoformat(created_at) if created_at else min(parsed),
+                "last_active": max(parsed),
+                "history": history,
+            }
         except Exception as e:
-            logger.error(f"Error loading session {session_id}: {e}")
+            logger.error("Error loading session %s: %s", session_id, e)
             return None
@@ -1,16 +1,61 @@
-import uuid
-from typing import List, Optional
-
-from fastapi import Depends, FastAPI, HTTPException, WebSocket
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Optional
+
+import orjson
+from fastapi import Depends, FastAPI, HTTPException, Request, Response, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.requests import HTTPConnection
 from fastapi.responses import HTMLResponse
 from pydantic import BaseModel
 
 from ..utils.config import Config
+from ..utils.logger import setup_logger
 from .response_generator import ResponseGenerator
 from .session_manager import SessionManager
 
-app = FastAPI(title="Report Portal LLM Query API")
+logger = logging.getLogger(__name__)
+
+# Bound concurrent LLM streams so a burst of sockets cannot starve the event loop
+MAX_CONCURRENT_STREAMS = 32
+STREAM_TIMEOUT_SECONDS = 60
+CACHE_MAINTENANCE_INTERVAL_SECONDS = 15 * 60
+
+_stream_slots = asyncio.Semaphore(MAX_CONCURRENT_STREAMS)
+_COMPLETE_MESSAGE = orjson.dumps({"type": "complete"}).decode()
+
+
+async def maintain_cache(response_generator: ResponseGenerator):
+    """Periodically expire cache entries and keep the SQLite WAL from growing."""
+    while True:
+        await asyncio.sleep(CACHE_MAINTENANCE_INTERVAL_SECONDS)
+        try:
+            await asyncio.to_thread(response_generator.cache_manager.maintain)
+        except Exception as e:
+            logger.error("Cache maintenance failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Build shared components on startup and release them on shutdown."""
+    config = Config.from_yaml("config/config.yaml")
+    setup_logger(config)
+    app.state.response_generator = ResponseGenerator(config)
+    app.state.session_manager = SessionManager(config)
+    maintenance = asyncio.create_task(maintain_cache(app.state.response_generator))
+    try:
+        yield
+    finally:
+        maintenance.cancel()
+        await app.state.response_generator.close()
+        for session_id in list(app.state.session_manager.sessions):
+            app.state.session_manager.close_session(session_id)
+
+
+app = FastAPI(title="Report Portal LLM Query API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -21,10 +66,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Initialize components
-config = Config.from_yaml("config/config.yaml")
-response_generator = ResponseGenerator(config)
-session_manager = SessionManager(config)
+
+def get_response_generator(conn: HTTPConnection) -> ResponseGenerator:
+    return conn.app.state.response_generator
+
+
+def get_session_manager(conn: HTTPConnection) -> SessionManager:
+    return conn.app.state.session_manager
 
 
 class QueryRequest(BaseModel):
@@ -32,7 +80,8 @@ class QueryRequest(BaseModel):
     session_id: Optional[str] = None
 
 
-class QueryResponse(BaseModel):
+@dataclass(slots=True)
+class QueryResponse:
     answer: str
     session_id: str
     metadata: Optional[dict] = None
@@ -45,7 +94,11 @@ async def root():
 
 
 @app.post("/query", response_model=QueryResponse)
-async def query_endpoint(request: QueryRequest):
+async def query_endpoint(
+    request: QueryRequest,
+    response_generator: ResponseGenerator = Depends(get_response_generator),
+    session_manager: SessionManager = Depends(get_session_manager),
+):
     """Process a single query."""
     try:
         # Create session if not provided
@@ -62,7 +115,11 @@ async def query_endpoint(request: QueryRequest):
 
 
 @app.websocket("/ws/{session_id}")
-async def websocket_endpoint(websocket: WebSocket, session_id: str):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    session_id: str,
+    response_generator: ResponseGenerator = Depends(get_response_generator),
+):
     """WebSocket endpoint for streaming responses."""
     await websocket.accept()
 
@@ -76,12 +133,24 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
                 await websocket.send_json({"error": "No query provided"})
                 continue
 
+            async def stream_response():
+                async for chunk in response_generator.generate_streaming_response(
+                    query, session_id
+                ):
+                    await websocket.send_text(
+                        orjson.dumps({"type": "chunk", "content": chunk}).decode()
+                    )
+
             # Stream response
-            async for chunk in response_generator.generate_streaming_response(query, session_id):
-                await websocket.send_json({"type": "chunk", "content": chunk})
+            async with _stream_slots:
+                try:
+                    await asyncio.wait_for(stream_response(), timeout=STREAM_TIMEOUT_SECONDS)
+                except asyncio.TimeoutError:
+                    await websocket.send_json({"error": "Response timed out"})
+                    continue
 
             # Send completion signal
-            await websocket.send_json({"type": "complete"})
+            await websocket.send_text(_COMPLETE_MESSAGE)
 
     except Exception as e:
         await websocket.send_json({"error": str(e)})
@@ -90,7 +159,9 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
 
 
 @app.get("/sessions/{session_id}/history")
-async def get_session_history(session_id: str):
+async def get_session_history(
+    session_id: str, session_manager: SessionManager = Depends(get_session_manager)
+):
     """Get query history for a session."""
     history = session_manager.get_session_history(session_id)
     if not history:
@@ -98,86 +169,94 @@ async def get_session_history(session_id: str):
     return {"session_id": session_id, "history": history}
 
 
-# Simple web UI
-@app.get("/ui", response_class=HTMLResponse)
-async def serve_ui():
-    """Serve a simple web UI."""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Report Portal LLM Query Interface</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 40px; }
-            #chat-container {
-                border: 1px solid #ddd;
-                height: 400px;
-                overflow-y: scroll;
-                padding: 10px;
-                margin-bottom: 10px;
-            }
-            .message { margin: 10px 0; }
-            .user { color: blue; }
-            .assistant { color: green; }
-            #query-input { width: 70%; padding: 5px; }
-            #send-button { padding: 5px 20px; }
-        </style>
-    </head>
-    <body>
-        <h1>Report Portal LLM Query Interface</h1>
-        <div id="chat-container"></div>
-        <input type="text" id="query-input" placeholder="Ask about test executions...">
-        <button id="send-button">Send</button>
-
-        <script>
-            const chatContainer = document.getElementById('chat-container');
-            const queryInput = document.getElementById('query-input');
-            const sendButton = document.getElementById('send-button');
-
-            let sessionId = null;
-
-            async function sendQuery() {
-                const query = queryInput.value.trim();
-                if (!query) return;
-
-                // Display user message
-                addMessage(query, 'user');
-                queryInput.value = '';
-
-                try {
-                    const response = await fetch('/query', {
-                        method: 'POST',
-                        headers: {'Content-Type': 'application/json'},
-                        body: JSON.stringify({
-                            query: query,
-                            session_id: sessionId
-                        })
-                    });
-
-                    const data = await response.json();
-                    sessionId = data.session_id;
-                    addMessage(data.answer, 'assistant');
-                } catch (error) {
-                    addMessage('Error: ' + error.message, 'assistant');
-                }
+# Simple web UI, encoded once at import time
+_UI_HTML = """\
+<!DOCTYPE html>
+<html>
+<head>
+    <title>Report Portal LLM Query Interface</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 40px; }
+        #chat-container {
+            border: 1px solid #ddd;
+            height: 400px;
+            overflow-y: scroll;
+            padding: 10px;
+            margin-bottom: 10px;
+        }
+        .message { margin: 10px 0; }
+        .user { color: blue; }
+        .assistant { color: green; }
+        #query-input { width: 70%; padding: 5px; }
+        #send-button { padding: 5px 20px; }
+    </style>
+</head>
+<body>
+    <h1>Report Portal LLM Query Interface</h1>
+    <div id="chat-container"></div>
+    <input type="text" id="query-input" placeholder="Ask about test executions...">
+    <button id="send-button">Send</button>
+
+    <script>
+        const chatContainer = document.getElementById('chat-container');
+        const queryInput = document.getElementById('query-input');
+        const sendButton = document.getElementById('send-button');
+
+        let sessionId = null;
+
+        async function sendQuery() {
+            const query = queryInput.value.trim();
+            if (!query) return;
+
+            // Display user message
+            addMessage(query, 'user');
+            queryInput.value = '';
+
+            try {
+                const response = await fetch('/query', {
+                    method: 'POST',
+                    headers: {'Content-Type': 'application/json'},
+                    body: JSON.stringify({
+                        query: query,
+                        session_id: sessionId
+                    })
+                });
+
+                const data = await response.json();
+                sessionId = data.session_id;
+                addMessage(data.answer, 'assistant');
+            } catch (error) {
+                addMessage('Error: ' + error.message, 'assistant');
             }
+        }
+
+        function addMessage(text, type) {
+            const messageDiv = document.createElement('div');
+            messageDiv.className = 'message ' + type;
+            messageDiv.textContent = type === 'user' ? 'You: ' + text : 'Assistant: ' + text;
+            chatContainer.appendChild(messageDiv);
+            chatContainer.scrollTop = chatContainer.scrollHeight;
+        }
+
+        sendButton.onclick = sendQuery;
+        queryInput.onkeypress = (e) => {
+            if (e.key === 'Enter') sendQuery();
+        };
+    </script>
+</body>
+</html>
+"""
+_UI_BYTES = _UI_HTML.encode("utf-8")
+_UI_ETAG = f'"{hashlib.md5(_UI_BYTES, usedforsecurity=False).hexdigest()}"'
+_UI_HEADERS = {"ETag": _UI_ETAG, "Cache-Control": "public, max-age=3600"}
 
-            function addMessage(text, type) {
-                const messageDiv = document.createElement('div');
-                messageDiv.className = 'message ' + type;
-                messageDiv.textContent = type === 'user' ? 'You: ' + text : 'Assistant: ' + text;
-                chatContainer.appendChild(messageDiv);
-                chatContainer.scrollTop = chatContainer.scrollHeight;
-            }
 
-            sendButton.onclick = sendQuery;
-            queryInput.onkeypress = (e) => {
-                if (e.key === 'Enter') sendQuery();
-            };
-        </script>
-    </body>
-    </html>
-    """
+@app.get("/ui", response_class=HTMLResponse)
+async def serve_ui(request: Request):
+    """Serve a simple web UI."""
+    if request.headers.get("if-none-match") == _UI_ETAG:
+        return Response(status_code=304, headers=_UI_HEADERS)
+    return Response(content=_UI_BYTES, media_type="text/html", headers=_UI_HEADERS)
 
 
 if __name__ == "__main__":
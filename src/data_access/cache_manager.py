@@ -1,14 +1,77 @@
+import asyncio
 import json
+import logging
 import pickle
 import sqlite3
+import threading
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from loguru import logger
+import msgpack
+import numpy as np
 
+from ..models.test_execution import Launch, TestExecution, TestIssue
 from ..utils.config import Config
 
+logger = logging.getLogger(__name__)
+
+# Blobs written by this version start with a format tag. Legacy pickle blobs
+# start with the pickle protocol opcode (0x80); unpickling can run arbitrary
+# code, so they are only read when cache.allow_legacy_pickle is enabled. That
+# option exists to migrate caches written before msgpack and will be removed
+# once those caches have expired.
+_MSGPACK_TAG = b"\x01"
+
+_EXT_DATETIME = 1
+_EXT_NDARRAY = 2
+_EXT_MODEL = 3
+
+# Only these models may be reconstructed from cached blobs
+_CACHEABLE_MODELS = {model.__name__: model for model in (Launch, TestExecution, TestIssue)}
+
+
+def _encode_ext(obj: Any) -> msgpack.ExtType:
+    """Encode types msgpack does not support natively."""
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, np.ndarray):
+        payload = [obj.dtype.str, list(obj.shape), obj.tobytes()]
+        return msgpack.ExtType(_EXT_NDARRAY, msgpack.packb(payload, use_bin_type=True))
+    if _CACHEABLE_MODELS.get(type(obj).__name__) is type(obj):
+        payload = [type(obj).__name__, obj.model_dump()]
+        return msgpack.ExtType(
+            _EXT_MODEL, msgpack.packb(payload, use_bin_type=True, default=_encode_ext)
+        )
+    raise TypeError(f"Cannot serialize object of type {type(obj).__name__}")
+
+
+def _decode_ext(code: int, data: bytes) -> Any:
+    """Decode extension types produced by _encode_ext."""
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_NDARRAY:
+        dtype, shape, buffer = msgpack.unpackb(data, raw=False)
+        return np.frombuffer(buffer, dtype=dtype).reshape(shape)
+    if code == _EXT_MODEL:
+        name, fields = msgpack.unpackb(data, raw=False, ext_hook=_decode_ext)
+        return _CACHEABLE_MODELS[name].model_validate(fields)
+    return msgpack.ExtType(code, data)
+
+
+def pack_value(value: Any) -> bytes:
+    """Serialize a value to a tagged msgpack blob."""
+    return _MSGPACK_TAG + msgpack.packb(value, use_bin_type=True, default=_encode_ext)
+
+
+def unpack_value(blob: bytes, allow_pickle: bool = False) -> Any:
+    """Deserialize a blob written by pack_value, or a legacy pickle blob if allowed."""
+    if blob[:1] == _MSGPACK_TAG:
+        return msgpack.unpackb(blob[1:], raw=False, ext_hook=_decode_ext)
+    if not allow_pickle:
+        raise ValueError("Refusing to unpickle a legacy cache blob")
+    return pickle.loads(blob)  # nosec B301
+
 
 class CacheManager:
     """Manages local caching of Report Portal data."""
@@ -18,12 +81,28 @@ class CacheManager:
         self.cache_dir.mkdir(exist_ok=True)
         self.db_path = self.cache_dir / "cache.db"
         self.ttl_hours = config.cache.ttl_hours
+        self.allow_legacy_pickle = config.cache.allow_legacy_pickle
+
+        # A single long-lived connection in autocommit mode; the lock serializes
+        # access since the connection is shared between threads.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
         self._init_db()
 
+        # Rows queued by aset() and the task that writes them in batches; both
+        # are created on first use inside a running event loop.
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+
     def _init_db(self):
         """Initialize SQLite database for caching."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn.execute("PRAGMA cache_size=-64000")
+            self._conn.execute("PRAGMA mmap_size=268435456")
+            self._conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS cache (
                     key TEXT PRIMARY KEY,
@@ -33,7 +112,7 @@ class CacheManager:
                 )
             """
             )
-            conn.execute(
+            self._conn.execute(
                 """
                 CREATE INDEX IF NOT EXISTS idx_expires_at
                 ON cache(expires_at)
@@ -42,43 +121,104 @@ class CacheManager:
 
     def get(self, key: str) -> Optional[Any]:
         """Retrieve cached value if not expired."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
+        with self._lock:
+            result = self._conn.execute(
                 """
                 SELECT value, expires_at FROM cache
                 WHERE key = ? AND expires_at > ?
             """,
                 (key, datetime.now()),
-            )
+            ).fetchone()
 
-            result = cursor.fetchone()
-            if result:
-                value_blob, _ = result
-                return pickle.loads(value_blob)  # nosec B301
+        if result:
+            value_blob, _ = result
+            try:
+                return unpack_value(value_blob, self.allow_legacy_pickle)
+            except ValueError:
+                # A legacy entry that may not be unpickled is treated as a miss
+                return None
 
         return None
 
-    def set(self, key: str, value: Any, ttl_hours: Optional[int] = None):
-        """Store value in cache with TTL."""
+    def _make_row(self, key: str, value: Any, ttl_hours: Optional[int]) -> Tuple:
+        """Serialize a value into a cache table row."""
         ttl = ttl_hours or self.ttl_hours
-        expires_at = datetime.now() + timedelta(hours=ttl)
-
-        value_blob = pickle.dumps(value)
+        now = datetime.now()
+        return (key, pack_value(value), now, now + timedelta(hours=ttl))
+
+    def _write_rows(self, rows: List[Tuple]):
+        """Write rows in a single transaction."""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO cache (key, value, created_at, expires_at)
+                    VALUES (?, ?, ?, ?)
+                """,
+                    rows,
+                )
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
-                """
-                INSERT OR REPLACE INTO cache (key, value, created_at, expires_at)
-                VALUES (?, ?, ?, ?)
-            """,
-                (key, value_blob, datetime.now(), expires_at),
-            )
+    def set(self, key: str, value: Any, ttl_hours: Optional[int] = None):
+        """Store value in cache with TTL."""
+        self._write_rows([self._make_row(key, value, ttl_hours)])
+
+    def set_many(self, items: Dict[str, Any], ttl_hours: Optional[int] = None):
+        """Store several values in one transaction."""
+        self._write_rows([self._make_row(key, value, ttl_hours) for key, value in items.items()])
+
+    async def aset(self, key: str, value: Any, ttl_hours: Optional[int] = None):
+        """Queue a value for the background writer instead of writing it inline."""
+        loop = asyncio.get_running_loop()
+        if self._writer is None or self._writer.done() or self._writer.get_loop() is not loop:
+            self._drain_queue()
+            self._queue = asyncio.Queue()
+            self._writer = loop.create_task(self._write_batches())
+
+        self._queue.put_nowait(self._make_row(key, value, ttl_hours))
+
+    async def flush(self):
+        """Wait until every queued write has been committed."""
+        if self._writer is not None and not self._writer.done():
+            await self._queue.join()
+
+    async def _write_batches(self):
+        """Write queued rows, batching whatever accumulated since the last commit."""
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                # Run the write in a thread so the commit does not block the loop
+                await asyncio.to_thread(self._write_rows, batch)
+            except Exception as e:
+                logger.error("Failed to write %s cache entries: %s", len(batch), e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _drain_queue(self):
+        """Synchronously write rows still queued for a writer that is not running."""
+        if self._queue is None:
+            return
+
+        rows = []
+        while not self._queue.empty():
+            rows.append(self._queue.get_nowait())
+            self._queue.task_done()
+
+        if rows:
+            self._write_rows(rows)
 
     def clear_expired(self):
         """Remove expired entries."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute(
+        with self._lock:
+            self._conn.execute(
                 """
                 DELETE FROM cache WHERE expires_at < ?
             """,
@@ -87,9 +227,26 @@ class CacheManager:
 
         logger.info("Cleared expired cache entries")
 
+    def maintain(self):
+        """Clear expired entries, refresh query planner stats and truncate the WAL."""
+        self.clear_expired()
+        with self._lock:
+            self._conn.execute("PRAGMA optimize")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def clear_all(self):
         """Clear entire cache."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM cache")
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
 
         logger.info("Cleared all cache entries")
+
+    def close(self):
+        """Write any queued entries and close the database connection."""
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+        self._drain_queue()
+
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,35 @@
-from datetime import datetime
+from collections import Counter
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
+from dateutil import tz
 
 from ..models.test_execution import Launch, TestExecution
 
+# tzfile-backed zones convert vectorized; tzlocal() falls back to per-element calls
+_LOCAL_TZ = tz.gettz()
+
+
+def _ms_to_local_datetime(timestamps_ms: np.ndarray) -> pd.DatetimeIndex:
+    """Convert epoch milliseconds to naive local datetimes, NaN becoming NaT."""
+    utc_times = pd.to_datetime(timestamps_ms, unit="ms", utc=True)
+    return utc_times.tz_convert(_LOCAL_TZ).tz_localize(None)
+
+
+# Below this size a Counter beats value_counts' hashing and sorting overhead
+_COUNTER_MAX_ROWS = 10_000
+
+# Low-cardinality columns stored as categoricals rather than repeated strings
+_CATEGORICAL_COLUMNS = ("status", "platform", "owner")
+
+
+def _value_counts(column: pd.Series) -> Dict[Any, int]:
+    """Count occurrences of each value, most common first."""
+    if len(column) < _COUNTER_MAX_ROWS:
+        return dict(Counter(column.tolist()).most_common())
+    return column.value_counts().to_dict()
+
 
 class DataNormalizer:
     """Normalize Report Portal data for LLM consumption."""
@@ -12,34 +37,47 @@ class DataNormalizer:
     @staticmethod
     def normalize_test_executions(test_executions: List[TestExecution]) -> pd.DataFrame:
         """Convert test executions to pandas DataFrame."""
-        data = []
-
-        for test in test_executions:
+        n = len(test_executions)
+        test_ids, names, statuses, platforms, owners = [], [], [], [], []
+        error_messages, tags, launch_ids, parent_ids = [], [], [], []
+        start_ms = np.empty(n, dtype=np.float64)
+        end_ms = np.full(n, np.nan, dtype=np.float64)
+
+        # Single pass over the models, filling one column list per field
+        for i, test in enumerate(test_executions):
             # Ensure attributes is a dictionary
             attributes = test.attributes if isinstance(test.attributes, dict) else {}
 
-            data.append(
-                {
-                    "test_id": str(test.id),
-                    "test_name": test.name,
-                    "status": test.status,
-                    "start_time": datetime.fromtimestamp(test.startTime / 1000),
-                    "end_time": (
-                        datetime.fromtimestamp(test.endTime / 1000) if test.endTime else None
-                    ),
-                    "duration_seconds": (
-                        (test.endTime - test.startTime) / 1000 if test.endTime else None
-                    ),
-                    "platform": attributes.get("platform", "unknown"),
-                    "owner": attributes.get("owner", "unknown"),
-                    "error_message": test.issue.comment if test.issue else None,
-                    "tags": ",".join(test.tags) if test.tags else "",
-                    "launch_id": str(test.launchId),
-                    "parent_id": str(test.parentId) if test.parentId else None,
-                }
-            )
-
-        return pd.DataFrame(data)
+            test_ids.append(str(test.id))
+            names.append(test.name)
+            statuses.append(test.status)
+            start_ms[i] = test.startTime
+            if test.endTime:
+                end_ms[i] = test.endTime
+            platforms.append(attributes.get("platform", "unknown"))
+            owners.append(attributes.get("owner", "unknown"))
+            error_messages.append(test.issue.comment if test.issue else None)
+            tags.append(",".join(test.tags) if test.tags else "")
+            launch_ids.append(str(test.launchId))
+            parent_ids.append(str(test.parentId) if test.parentId else None)
+
+        df = pd.DataFrame(
+            {
+                "test_id": test_ids,
+                "test_name": names,
+                "status": statuses,
+                "start_time": _ms_to_local_datetime(start_ms),
+                "end_time": _ms_to_local_datetime(end_ms),
+                "duration_seconds": (end_ms - start_ms) / 1000,
+                "platform": platforms,
+                "owner": owners,
+                "error_message": error_messages,
+                "tags": tags,
+                "launch_id": launch_ids,
+                "parent_id": parent_ids,
+            }
+        )
+        return df.astype(dict.fromkeys(_CATEGORICAL_COLUMNS, "category"))
 
     @staticmethod
     def create_test_summary(df: pd.DataFrame) -> Dict[str, Any]:
@@ -47,24 +85,28 @@ class DataNormalizer:
         if df.empty:
             return {}
 
+        status = df["status"]
+        failed_mask = status == "FAILED"
+        passed_mask = status == "PASSED"
+
         summary = {
             "total_executions": len(df),
             "unique_tests": df["test_name"].nunique(),
-            "status_distribution": df["status"].value_counts().to_dict(),
-            "platform_distribution": df["platform"].value_counts().to_dict(),
+            "status_distribution": _value_counts(status),
+            "platform_distribution": _value_counts(df["platform"]),
             "average_duration": df["duration_seconds"].mean(),
-            "failure_rate": (df["status"] == "FAILED").mean() * 100,
+            "failure_rate": failed_mask.mean() * 100,
             "date_range": {
                 "start": df["start_time"].min().isoformat() if not df.empty else None,
                 "end": df["start_time"].max().isoformat() if not df.empty else None,
             },
         }
 
-        # Identify flaky tests
-        test_status_counts = df.groupby("test_name")["status"].value_counts().unstack(fill_value=0)
-        flaky_tests = test_status_counts[
-            (test_status_counts.get("PASSED", 0) > 0) & (test_status_counts.get("FAILED", 0) > 0)
-        ].index.tolist()
+        # Identify flaky tests: those with both passed and failed executions
+        test_names = df["test_name"]
+        passed_tests = set(test_names[passed_mask].unique())
+        failed_tests = set(test_names[failed_mask].unique())
+        flaky_tests = sorted(passed_tests & failed_tests)
 
         summary["flaky_tests"] = flaky_tests[:10]  # Top 10 flaky tests
 
@@ -80,5 +122,6 @@ class DataNormalizer:
         columns = ["test_name", "status", "start_time", "platform", "owner", "error_message"]
         df_subset = df[columns].head(max_rows)
 
-        # Convert to string representation
-        return df_subset.to_string(index=False, max_rows=max_rows)
+        # Pipe-separated rows are much cheaper to build than to_string's
+        # column-aligned layout, and avoid padding the prompt with whitespace
+        return df_subset.to_csv(sep="|", index=False, lineterminator="\n")
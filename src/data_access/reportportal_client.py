@@ -1,16 +1,25 @@
 import asyncio
+import itertools
+import logging
 import ssl
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import certifi
 import httpx
-from loguru import logger
+import orjson
 from pydantic import BaseModel, Field
 
-from ..models.test_execution import Launch, TestExecution
+from ..models.test_execution import (
+    LAUNCHES_ADAPTER,
+    TEST_EXECUTIONS_ADAPTER,
+    Launch,
+    TestExecution,
+)
 from ..utils.config import Config
 
+logger = logging.getLogger(__name__)
+
 
 class ReportPortalClient:
     """Client for interacting with Report Portal API."""
@@ -37,20 +46,66 @@ class ReportPortalClient:
             # Use certifi for proper SSL verification
             verify = certifi.where()
 
+        # One pooled client is shared by all requests (including the concurrent
+        # per-launch fetches). HTTP/2 multiplexes them over a single connection,
+        # and the transport retries failed connection attempts instead of
+        # surfacing transient errors to the caller.
+        transport = httpx.AsyncHTTPTransport(
+            verify=verify,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0
+            ),
+            retries=2,
+        )
+
         self.client = httpx.AsyncClient(
             base_url=self.base_url,
             headers={
                 "Authorization": f"Bearer {self.auth_token}",
                 "Content-Type": "application/json",
             },
-            timeout=30.0,
-            verify=verify,
+            timeout=httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=30.0),
+            transport=transport,
         )
 
-    async def get_launches(
+        # Bounds in-flight requests across all concurrent fetches on this client
+        self._semaphore = asyncio.Semaphore(config.reportportal.max_concurrent_fetches)
+
+    async def _get_page(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a single page of results."""
+        async with self._semaphore:
+            response = await self.client.get(endpoint, params=params)
+        response.raise_for_status()
+        # orjson parses the raw body directly, several times faster than stdlib json
+        return orjson.loads(response.content)
+
+    async def _iter_pages(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield the content of each page, fetching pages after the first concurrently."""
+        data = await self._get_page(endpoint, params)
+        yield data.get("content", [])
+
+        # The first page reports how many pages there are; request the rest at
+        # once and let the semaphore bound how many are in flight
+        first_page, total_pages = data["page"]["number"], data["page"]["totalPages"]
+        if first_page >= total_pages:
+            return
+
+        pages = await asyncio.gather(
+            *(
+                self._get_page(endpoint, {**params, "page.page": page})
+                for page in range(first_page + 1, total_pages + 1)
+            )
+        )
+        for data in pages:
+            yield data.get("content", [])
+
+    async def iter_launches(
         self, filter_params: Optional[Dict[str, Any]] = None, page_size: int = 100
-    ) -> List[Launch]:
-        """Fetch launches with optional filtering."""
+    ) -> AsyncIterator[Launch]:
+        """Yield launches with optional filtering as each page arrives."""
         endpoint = f"/api/v1/{self.project}/launch"
 
         params = {"page.size": page_size, "page.page": 1, "page.sort": "startTime,DESC"}
@@ -58,35 +113,25 @@ class ReportPortalClient:
         if filter_params:
             params.update(filter_params)
 
-        launches = []
-
         try:
-            while True:
-                response = await self.client.get(endpoint, params=params)
-                response.raise_for_status()
-
-                data = response.json()
-                content = data.get("content", [])
-
-                for launch_data in content:
-                    launches.append(Launch(**launch_data))
-
-                # Check if there are more pages
-                if data["page"]["number"] >= data["page"]["totalPages"]:
-                    break
-
-                params["page.page"] += 1
+            async for content in self._iter_pages(endpoint, params):
+                for launch in LAUNCHES_ADAPTER.validate_python(content):
+                    yield launch
 
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching launches: {e}")
+            logger.error("Error fetching launches: %s", e)
             raise
 
-        return launches
+    async def get_launches(
+        self, filter_params: Optional[Dict[str, Any]] = None, page_size: int = 100
+    ) -> List[Launch]:
+        """Fetch launches with optional filtering."""
+        return [launch async for launch in self.iter_launches(filter_params, page_size)]
 
-    async def get_test_items(
+    async def iter_test_items(
         self, launch_id: str, filter_params: Optional[Dict[str, Any]] = None
-    ) -> List[TestExecution]:
-        """Fetch test items for a specific launch."""
+    ) -> AsyncIterator[TestExecution]:
+        """Yield test items for a specific launch as each page arrives."""
         endpoint = f"/api/v1/{self.project}/item"
 
         params = {"filter.eq.launchId": launch_id, "page.size": 200, "page.page": 1}
@@ -94,29 +139,20 @@ class ReportPortalClient:
         if filter_params:
             params.update(filter_params)
 
-        test_items = []
-
         try:
-            while True:
-                response = await self.client.get(endpoint, params=params)
-                response.raise_for_status()
-
-                data = response.json()
-                content = data.get("content", [])
-
-                for item_data in content:
-                    test_items.append(TestExecution(**item_data))
-
-                if data["page"]["number"] >= data["page"]["totalPages"]:
-                    break
-
-                params["page.page"] += 1
+            async for content in self._iter_pages(endpoint, params):
+                for item in TEST_EXECUTIONS_ADAPTER.validate_python(content):
+                    yield item
 
         except httpx.HTTPError as e:
-            logger.error(f"Error fetching test items: {e}")
+            logger.error("Error fetching test items: %s", e)
             raise
 
-        return test_items
+    async def get_test_items(
+        self, launch_id: str, filter_params: Optional[Dict[str, Any]] = None
+    ) -> List[TestExecution]:
+        """Fetch test items for a specific launch."""
+        return [item async for item in self.iter_test_items(launch_id, filter_params)]
 
     async def get_test_history(self, test_name: str, days_back: int = 30) -> List[TestExecution]:
         """Get historical executions of a specific test."""
@@ -130,12 +166,12 @@ class ReportPortalClient:
         # First get relevant launches
         launches = await self.get_launches(filter_params)
 
-        all_test_items = []
-        for launch in launches:
-            items = await self.get_test_items(launch.id, {"filter.eq.name": test_name})
-            all_test_items.extend(items)
+        # Fetch matching items from all launches concurrently
+        results = await asyncio.gather(
+            *(self.get_test_items(launch.id, {"filter.eq.name": test_name}) for launch in launches)
+        )
 
-        return all_test_items
+        return list(itertools.chain.from_iterable(results))
 
     async def close(self):
         """Close the HTTP client."""
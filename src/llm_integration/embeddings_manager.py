@@ -1,17 +1,58 @@
+import fcntl
 import hashlib
-import pickle
+import logging
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+import msgpack
 import numpy as np
 import openai
-from loguru import logger
 from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 
+from ..data_access.cache_manager import unpack_value
 from ..models.test_execution import TestExecution
 from ..utils.config import Config
 
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Return a float32 copy of matrix with each row scaled to unit length."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    # Zero vectors stay zero, matching sklearn's cosine_similarity
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def _connected_components(n: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+    """Label the connected components of an undirected graph given as edge arrays.
+
+    A vectorized union-find: every edge hooks the larger root onto the smaller
+    one, then pointer jumping flattens the trees, until no edge joins two roots.
+    Each node ends up labelled with the smallest node index in its component.
+    """
+    parent = np.arange(n)
+    while True:
+        root_a, root_b = parent[rows], parent[cols]
+        crossing = root_a != root_b
+        if not crossing.any():
+            return parent
+
+        low = np.minimum(root_a[crossing], root_b[crossing])
+        high = np.maximum(root_a[crossing], root_b[crossing])
+        np.minimum.at(parent, high, low)
+
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+
+# Initial number of rows allocated in the embeddings store; doubled when full
+_STORE_INITIAL_CAPACITY = 1024
+
 
 class EmbeddingsManager:
     """Manage embeddings for semantic search and similarity matching."""
@@ -21,13 +62,30 @@ class EmbeddingsManager:
         self.embeddings_cache_dir = Path(config.cache.directory) / "embeddings"
         self.embeddings_cache_dir.mkdir(exist_ok=True)
 
+        # Embeddings live in one memory-mapped float32 matrix; an append-only
+        # msgpack log maps each cache key to its row. Other processes may share
+        # the directory, so rows are allocated under a lock on the log.
+        self._store_file = self.embeddings_cache_dir / "emb.f32"
+        self._index_file = self.embeddings_cache_dir / "index.msgpack"
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._next_row = 0
+        self._dim: Optional[int] = None
+        self._store: Optional[np.memmap] = None
+        self._index_handle = None
+        self._open_store()
+
         # Initialize embedding model based on provider
         if config.llm.provider == "openai":
             self.use_openai = True
             self.embedding_model = "text-embedding-ada-002"
         else:
             self.use_openai = False
-            self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+            # One model instance is shared by every encode call; on CUDA it runs
+            # in half precision, halving memory traffic
+            self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2", device=config.llm.device)
+            if self.embedding_model.device.type == "cuda":
+                self.embedding_model.half()
 
     def get_embedding(self, text: str, cache_key: Optional[str] = None) -> np.ndarray:
         """Get embedding for a text string."""
@@ -42,7 +100,9 @@ class EmbeddingsManager:
                 response = openai.Embedding.create(model=self.embedding_model, input=text)
                 embedding = np.array(response["data"][0]["embedding"])
             else:
-                embedding = self.embedding_model.encode(text)
+                embedding = self.embedding_model.encode(
+                    text, normalize_embeddings=True, show_progress_bar=False
+                )
 
             # Cache the result
             if cache_key:
@@ -51,7 +111,7 @@ class EmbeddingsManager:
             return embedding
 
         except Exception as e:
-            logger.error(f"Error generating embedding: {e}")
+            logger.error("Error generating embedding: %s", e)
             raise
 
     def get_batch_embeddings(self, texts: List[str]) -> List[np.ndarray]:
@@ -68,32 +128,47 @@ class EmbeddingsManager:
                     batch_embeddings = [np.array(item["embedding"]) for item in response["data"]]
                     embeddings.extend(batch_embeddings)
                 except Exception as e:
-                    logger.error(f"Error in batch embedding: {e}")
+                    logger.error("Error in batch embedding: %s", e)
                     # Fallback to individual embeddings
                     for text in batch:
                         embeddings.append(self.get_embedding(text))
         else:
             # Sentence transformers handle batching internally
-            embeddings = self.embedding_model.encode(texts)
+            embeddings = self.embedding_model.encode(
+                texts,
+                batch_size=128,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
 
         return embeddings
 
     def create_test_embeddings(self, test_executions: List[TestExecution]) -> Dict[str, np.ndarray]:
         """Create embeddings for test executions."""
-        test_embeddings = {}
-
-        for test in test_executions:
-            # Create a text representation of the test
-            test_text = self._create_test_text(test)
-
-            # Generate cache key
-            cache_key = self._generate_cache_key(test_text)
+        # Create a text representation and cache key for each test
+        texts = [self._create_test_text(test) for test in test_executions]
+        cache_keys = [self._generate_cache_key(text) for text in texts]
+
+        # Resolve each distinct text once, collecting cache misses for one batch call
+        embeddings: Dict[str, np.ndarray] = {}
+        missing: Dict[str, str] = {}
+        for cache_key, text in zip(cache_keys, texts):
+            if cache_key in embeddings or cache_key in missing:
+                continue
+            cached = self._load_from_cache(cache_key, legacy_text=text)
+            if cached is not None:
+                embeddings[cache_key] = cached
+            else:
+                missing[cache_key] = text
 
-            # Get embedding
-            embedding = self.get_embedding(test_text, cache_key)
-            test_embeddings[test.id] = embedding
+        if missing:
+            batch = self.get_batch_embeddings(list(missing.values()))
+            for cache_key, embedding in zip(missing, batch):
+                self._save_to_cache(cache_key, embedding)
+                embeddings[cache_key] = embedding
 
-        return test_embeddings
+        return {test.id: embeddings[key] for test, key in zip(test_executions, cache_keys)}
 
     def find_similar_tests(
         self,
@@ -103,18 +178,25 @@ class EmbeddingsManager:
         threshold: float = 0.7,
     ) -> List[Tuple[str, float]]:
         """Find tests similar to the query."""
-        similarities = []
+        if not test_embeddings or top_k <= 0:
+            return []
 
-        for test_id, test_embedding in test_embeddings.items():
-            similarity = cosine_similarity([query_embedding], [test_embedding])[0][0]
+        test_ids = list(test_embeddings)
+        matrix = _normalize_rows(np.vstack(list(test_embeddings.values())))
+        query = _normalize_rows(np.asarray(query_embedding).reshape(1, -1))[0]
 
-            if similarity >= threshold:
-                similarities.append((test_id, float(similarity)))
+        # One matrix-vector product yields every cosine similarity at once
+        similarities = matrix @ query
+        candidates = np.flatnonzero(similarities >= threshold)
+
+        if len(candidates) > top_k:
+            top = np.argpartition(-similarities[candidates], top_k - 1)[:top_k]
+            candidates = candidates[top]
 
         # Sort by similarity descending
-        similarities.sort(key=lambda x: x[1], reverse=True)
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
 
-        return similarities[:top_k]
+        return [(test_ids[i], float(similarities[i])) for i in candidates]
 
     def cluster_similar_failures(
         self, test_executions: List[TestExecution], similarity_threshold: float = 0.8
@@ -128,75 +210,212 @@ class EmbeddingsManager:
         # Create embeddings for failure messages
         failure_texts = [f"{test.name} {test.issue.comment or ''}" for test in failed_tests]
 
-        embeddings = self.get_batch_embeddings(failure_texts)
-
-        # Simple clustering based on similarity
-        clusters = []
-        clustered_indices = set()
+        embeddings = _normalize_rows(np.vstack(self.get_batch_embeddings(failure_texts)))
+        similarities = embeddings @ embeddings.T
 
-        for i, embedding_i in enumerate(embeddings):
-            if i in clustered_indices:
-                continue
-
-            cluster = [failed_tests[i]]
-            clustered_indices.add(i)
-
-            for j, embedding_j in enumerate(embeddings):
-                if j <= i or j in clustered_indices:
-                    continue
-
-                similarity = cosine_similarity([embedding_i], [embedding_j])[0][0]
+        # Clusters are the connected components of the thresholded similarity graph
+        rows, cols = np.nonzero(np.triu(similarities >= similarity_threshold, k=1))
+        labels = _connected_components(len(failed_tests), rows, cols)
 
-                if similarity >= similarity_threshold:
-                    cluster.append(failed_tests[j])
-                    clustered_indices.add(j)
-
-            clusters.append(cluster)
+        # Labels are each component's smallest index, so clusters come out
+        # ordered by their first member with members in input order
+        component_ids, cluster_of = np.unique(labels, return_inverse=True)
+        clusters = [[] for _ in component_ids]
+        for test, cluster in zip(failed_tests, cluster_of):
+            clusters[cluster].append(test)
 
         return clusters
 
     def _create_test_text(self, test: TestExecution) -> str:
         """Create text representation of a test for embedding."""
-        parts = [
-            f"Test: {test.name}",
-            f"Status: {test.status}",
-            f"Platform: {test.attributes.get('platform', 'unknown')}",
-            f"Owner: {test.attributes.get('owner', 'unknown')}",
-        ]
+        attributes = test.attributes
+        text = (
+            f"Test: {test.name} | Status: {test.status}"
+            f" | Platform: {attributes.get('platform', 'unknown')}"
+            f" | Owner: {attributes.get('owner', 'unknown')}"
+        )
 
-        if test.issue and test.issue.comment:
-            parts.append(f"Error: {test.issue.comment[:500]}")
+        issue = test.issue
+        if issue and issue.comment:
+            text += f" | Error: {issue.comment[:500]}"
 
         if test.description:
-            parts.append(f"Description: {test.description[:200]}")
+            text += f" | Description: {test.description[:200]}"
 
         if test.tags:
-            parts.append(f"Tags: {', '.join(test.tags)}")
+            text += f" | Tags: {', '.join(test.tags)}"
 
-        return " | ".join(parts)
+        return text
 
     def _generate_cache_key(self, text: str) -> str:
         """Generate cache key for text."""
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def _legacy_cache_key(text: str) -> str:
+        """Cache key used for text before keys moved from MD5 to BLAKE2b."""
         return hashlib.md5(text.encode(), usedforsecurity=False).hexdigest()
 
+    def _open_store(self):
+        """Load the key-to-row index and map the embeddings file, if present."""
+        try:
+            self._refresh_index()
+            self._map_store()
+        except Exception as e:
+            logger.warning("Failed to open embeddings store: %s", e)
+            self._index, self._dim, self._store = {}, None, None
+            self._index_offset = self._next_row = 0
+
+    def _refresh_index(self):
+        """Apply index records appended since the last read, by any process."""
+        try:
+            size = self._index_file.stat().st_size
+        except FileNotFoundError:
+            return
+        if size <= self._index_offset:
+            return
+
+        with open(self._index_file, "rb") as f:
+            f.seek(self._index_offset)
+            # A record still being written is left for the next refresh
+            unpacker = msgpack.Unpacker(f, raw=False)
+            for record in unpacker:
+                if isinstance(record, dict):
+                    self._dim = record["dim"]
+                else:
+                    key, row = record
+                    self._index[key] = row
+                    self._next_row = max(self._next_row, row + 1)
+            self._index_offset += unpacker.tell()
+
+    def _map_store(self):
+        """Map the embeddings file at its current size."""
+        if not self._dim or not self._store_file.exists():
+            return
+        capacity = self._store_file.stat().st_size // (self._dim * 4)
+        if capacity and (self._store is None or self._store.shape[0] != capacity):
+            if self._store is not None:
+                self._store.flush()
+            self._store = np.memmap(
+                self._store_file, dtype=np.float32, mode="r+", shape=(capacity, self._dim)
+            )
+
+    @contextmanager
+    def _locked_index(self):
+        """Hold an exclusive lock on the index log, shared with other processes."""
+        if self._index_handle is None:
+            self._index_handle = open(self._index_file, "ab")
+        fcntl.flock(self._index_handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._index_handle, fcntl.LOCK_UN)
+
+    def _append_index_record(self, record: Any):
+        """Append a record to the on-disk index log; the caller holds the lock."""
+        self._index_handle.write(msgpack.packb(record, use_bin_type=True))
+        self._index_handle.flush()
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the store file so it can hold at least rows embeddings.
+
+        The caller holds the lock. The file size is read afresh because another
+        process may already have grown it, and it is never truncated below
+        that size, which would pull pages out from under the other mapping.
+        """
+        size = self._store_file.stat().st_size if self._store_file.exists() else 0
+        capacity = size // (self._dim * 4)
+        if rows > capacity:
+            new_capacity = max(rows, capacity * 2, _STORE_INITIAL_CAPACITY)
+            with open(self._store_file, "ab") as f:
+                f.truncate(max(new_capacity * self._dim * 4, size))
+        self._map_store()
+
     def _save_to_cache(self, key: str, embedding: np.ndarray):
-        """Save embedding to cache."""
-        cache_file = self.embeddings_cache_dir / f"{key}.pkl"
+        """Save embedding to the memory-mapped store."""
+        embedding = np.asarray(embedding, dtype=np.float32).ravel()
         try:
-            with open(cache_file, "wb") as f:
-                pickle.dump(embedding, f)
+            if key in self._index:
+                return
+
+            with self._locked_index():
+                # Pick up rows other processes allocated since the last read
+                self._refresh_index()
+                if key in self._index:
+                    return
+
+                if self._dim is None:
+                    self._dim = embedding.size
+                    self._append_index_record({"dim": self._dim})
+                elif embedding.size != self._dim:
+                    logger.warning(
+                        "Not caching embedding of size %s; store holds %s",
+                        embedding.size,
+                        self._dim,
+                    )
+                    return
+
+                # The vector is written before its index record, so a reader
+                # that sees the record also sees the data
+                row = self._next_row
+                self._ensure_capacity(row + 1)
+                self._store[row] = embedding
+                self._append_index_record([key, row])
+                self._index[key] = row
+                self._next_row = row + 1
         except Exception as e:
-            logger.warning(f"Failed to cache embedding: {e}")
+            logger.warning("Failed to cache embedding: %s", e)
+
+    def _load_from_cache(self, key: str, legacy_text: Optional[str] = None) -> Optional[np.ndarray]:
+        """Load embedding from the store, migrating legacy keys and per-key cache files.
+
+        legacy_text is the text key was derived from; its MD5 key is only
+        computed when key itself misses.
+        """
+        embedding = self._read_cached(key)
+        if embedding is not None:
+            return embedding
 
-    def _load_from_cache(self, key: str) -> Optional[np.ndarray]:
-        """Load embedding from cache."""
-        cache_file = self.embeddings_cache_dir / f"{key}.pkl"
+        if legacy_text is None:
+            return None
+
+        embedding = self._read_cached(self._legacy_cache_key(legacy_text))
+        if embedding is not None:
+            self._save_to_cache(key, embedding)
+        return embedding
+
+    def _read_cached(self, key: str) -> Optional[np.ndarray]:
+        """Read an embedding from the store or a legacy per-key cache file."""
+        if key not in self._index:
+            # Another process may have stored it since the last read
+            self._refresh_index()
+        row = self._index.get(key)
+        if row is not None:
+            if self._store is None or row >= self._store.shape[0]:
+                self._map_store()
+            if self._store is not None and row < self._store.shape[0]:
+                return np.array(self._store[row])
+
+        for suffix in (".msgpack", ".pkl"):
+            cache_file = self.embeddings_cache_dir / f"{key}{suffix}"
+
+            if cache_file.exists():
+                try:
+                    with open(cache_file, "rb") as f:
+                        embedding = unpack_value(f.read(), self.config.cache.allow_legacy_pickle)
+                except Exception as e:
+                    logger.warning("Failed to load cached embedding: %s", e)
+                    continue
 
-        if cache_file.exists():
-            try:
-                with open(cache_file, "rb") as f:
-                    return pickle.load(f)  # nosec B301
-            except Exception as e:
-                logger.warning(f"Failed to load cached embedding: {e}")
+                self._save_to_cache(key, embedding)
+                return embedding
 
         return None
+
+    def close(self):
+        """Flush the embeddings store and close the index log."""
+        if self._store is not None:
+            self._store.flush()
+        if self._index_handle is not None:
+            self._index_handle.close()
+            self._index_handle = None
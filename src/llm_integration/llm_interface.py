@@ -1,16 +1,58 @@
+import functools
+import hashlib
+import logging
 import os
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import openai
 from langchain.schema import HumanMessage, SystemMessage
 from langchain_community.chat_models import ChatOpenAI
 from langchain_community.llms import HuggingFacePipeline, LlamaCpp
-from loguru import logger
 from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline
 
 from ..utils.config import Config
 
+logger = logging.getLogger(__name__)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_encoding(model_name: str):
+    """Return the tiktoken encoding for a model, building its BPE tables only once."""
+    import tiktoken
+
+    try:
+        return tiktoken.encoding_for_model(model_name)
+    except KeyError:
+        # Unknown model names fall back to the encoding used by current OpenAI models
+        return tiktoken.get_encoding("cl100k_base")
+
+
+_TOKEN_COUNT_CACHE_SIZE = 4096
+# Keyed on a digest of the text rather than the text itself, so cached counts
+# for large prompts do not keep the prompts alive
+_token_counts: "OrderedDict[Tuple[str, bytes], int]" = OrderedDict()
+_token_counts_lock = threading.Lock()
+
+
+def _count_tokens(model_name: str, text: str) -> int:
+    """Count tokens for a model; repeated prompts and context blocks hit the cache."""
+    key = (model_name, hashlib.blake2b(text.encode(), digest_size=16).digest())
+    with _token_counts_lock:
+        count = _token_counts.get(key)
+        if count is not None:
+            _token_counts.move_to_end(key)
+            return count
+
+    count = len(_get_encoding(model_name).encode(text))
+    with _token_counts_lock:
+        _token_counts[key] = count
+        if len(_token_counts) > _TOKEN_COUNT_CACHE_SIZE:
+            _token_counts.popitem(last=False)
+    return count
+
 
 class LLMProvider(Enum):
     OPENAI = "openai"
@@ -117,7 +159,7 @@ class LLMInterface:
                 return str(response)
 
         except Exception as e:
-            logger.error(f"Error generating LLM response: {e}")
+            logger.error("Error generating LLM response: %s", e)
             raise
 
     async def generate_streaming_response(self, prompt: Dict[str, str]):
@@ -137,17 +179,14 @@ class LLMInterface:
                 yield response
 
         except Exception as e:
-            logger.error(f"Error in streaming response: {e}")
+            logger.error("Error in streaming response: %s", e)
             yield f"Error: {str(e)}"
 
     def count_tokens(self, text: str) -> int:
         """Count tokens in text."""
         if self.provider == LLMProvider.OPENAI:
             # Use tiktoken for OpenAI models
-            import tiktoken
-
-            enc = tiktoken.encoding_for_model(self.config.llm.model_name)
-            return len(enc.encode(text))
+            return _count_tokens(self.config.llm.model_name, text)
         else:
             # Rough estimate for other models
             return len(text.split()) * 1.3
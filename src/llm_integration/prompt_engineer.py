@@ -1,5 +1,8 @@
+import functools
+import io
+import string
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import yaml
 
@@ -7,12 +10,47 @@ from ..models.query_models import QueryIntent
 from ..utils.config import Config
 
 
+@functools.lru_cache(maxsize=256)
+def _render_summary_stats(
+    total_executions: int,
+    unique_tests: int,
+    failure_rate: float,
+    status_distribution: Optional[Tuple[Tuple[Any, int], ...]],
+    platform_distribution: Optional[Tuple[Tuple[Any, int], ...]],
+    flaky_tests: Tuple[str, ...],
+) -> str:
+    """Render summary statistics; cached since chat sessions repeat summaries."""
+    formatted = io.StringIO()
+    formatted.write(f"Total Executions: {total_executions}\n")
+    formatted.write(f"Unique Tests: {unique_tests}\n")
+    formatted.write(f"Overall Failure Rate: {failure_rate:.2f}%")
+
+    if status_distribution is not None:
+        formatted.write("\n\nStatus Distribution:")
+        for status, count in status_distribution:
+            formatted.write(f"\n  - {status}: {count}")
+
+    if platform_distribution is not None:
+        formatted.write("\n\nPlatform Distribution:")
+        for platform, count in platform_distribution:
+            formatted.write(f"\n  - {platform}: {count}")
+
+    if flaky_tests:
+        formatted.write(f"\n\nFlaky Tests Detected: {len(flaky_tests)}")
+        formatted.write("\nTop Flaky Tests:")
+        for test in flaky_tests[:5]:
+            formatted.write(f"\n  - {test}")
+
+    return formatted.getvalue()
+
+
 class PromptEngineer:
     """Construct effective prompts for LLM based on query context."""
 
     def __init__(self, config: Config):
         self.config = config
         self.prompts = self._load_prompt_templates()
+        self._templates = self._compile_templates()
 
     def _load_prompt_templates(self) -> Dict[str, str]:
         """Load prompt templates from configuration."""
@@ -56,25 +94,43 @@ class PromptEngineer:
             Provide a comprehensive summary with key metrics and insights.""",
         }
 
+    def _compile_templates(self) -> Dict[str, Tuple[Callable[[Dict[str, str]], str], bool]]:
+        """Bind each template's format_map and note whether it uses summary stats."""
+        by_query_type = {
+            "flaky_analysis": "flaky_analysis",
+            "statistics": "summary_statistics",
+            "default": "test_analysis",
+        }
+
+        templates = {}
+        for query_type, name in by_query_type.items():
+            template = self.prompts[name]
+            fields = {field for _, field, _, _ in string.Formatter().parse(template) if field}
+            templates[query_type] = (template.format_map, "summary_stats" in fields)
+        return templates
+
     def construct_prompt(
         self, query_intent: QueryIntent, context: str, summary_stats: Dict[str, Any] = None
     ) -> Dict[str, str]:
         """Construct appropriate prompt based on query intent."""
 
         # Select appropriate template
-        if query_intent.query_type.value == "flaky_analysis":
-            template = self.prompts["flaky_analysis"]
-        elif query_intent.query_type.value == "statistics":
-            template = self.prompts["summary_statistics"]
-        else:
-            template = self.prompts["test_analysis"]
-
-        # Build the prompt
-        user_prompt = template.format(
-            context=context,
-            query=query_intent.original_query,
-            summary_stats=self._format_summary_stats(summary_stats) if summary_stats else "",
-            recent_tests=context,
+        format_map, uses_summary_stats = self._templates.get(
+            query_intent.query_type.value, self._templates["default"]
+        )
+
+        # Build the prompt; summary stats are only formatted when the template uses them
+        user_prompt = format_map(
+            {
+                "context": context,
+                "query": query_intent.original_query,
+                "summary_stats": (
+                    self._format_summary_stats(summary_stats)
+                    if summary_stats and uses_summary_stats
+                    else ""
+                ),
+                "recent_tests": context,
+            }
         )
 
         return {"system": self.prompts["system"], "user": user_prompt}
@@ -84,28 +140,22 @@ class PromptEngineer:
         if not stats:
             return "No summary statistics available."
 
-        formatted = []
-        formatted.append(f"Total Executions: {stats.get('total_executions', 0)}")
-        formatted.append(f"Unique Tests: {stats.get('unique_tests', 0)}")
-        formatted.append(f"Overall Failure Rate: {stats.get('failure_rate', 0):.2f}%")
-
-        if "status_distribution" in stats:
-            formatted.append("\nStatus Distribution:")
-            for status, count in stats["status_distribution"].items():
-                formatted.append(f"  - {status}: {count}")
-
-        if "platform_distribution" in stats:
-            formatted.append("\nPlatform Distribution:")
-            for platform, count in stats["platform_distribution"].items():
-                formatted.append(f"  - {platform}: {count}")
-
-        if "flaky_tests" in stats and stats["flaky_tests"]:
-            formatted.append(f"\nFlaky Tests Detected: {len(stats['flaky_tests'])}")
-            formatted.append("Top Flaky Tests:")
-            for test in stats["flaky_tests"][:5]:
-                formatted.append(f"  - {test}")
-
-        return "\n".join(formatted)
+        # Only the rendered fields form the cache key, as hashable tuples
+        status_distribution = stats.get("status_distribution")
+        platform_distribution = stats.get("platform_distribution")
+        args = (
+            stats.get("total_executions", 0),
+            stats.get("unique_tests", 0),
+            stats.get("failure_rate", 0),
+            tuple(status_distribution.items()) if status_distribution is not None else None,
+            tuple(platform_distribution.items()) if platform_distribution is not None else None,
+            tuple(stats.get("flaky_tests") or ()),
+        )
+        try:
+            return _render_summary_stats(*args)
+        except TypeError:
+            # Unhashable values cannot be cached; render them directly
+            return _render_summary_stats.__wrapped__(*args)
 
     def create_few_shot_examples(self) -> List[Dict[str, str]]:
         """Create few-shot examples for better query understanding."""
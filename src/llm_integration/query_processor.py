@@ -1,37 +1,119 @@
+import functools
 import re
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
-from loguru import logger
 from pydantic import BaseModel
 
 from ..models.query_models import FilterCriteria, QueryIntent, QueryType, TimeFilter
 
 
+def _parse_days(value: str) -> int:
+    return int(value)
+
+
+def _parse_weeks(value: str) -> int:
+    return int(value) * 7
+
+
+def _parse_hours(value: str) -> int:
+    return 1  # Convert to days
+
+
+def _parse_date(value: str) -> int:
+    date = datetime.strptime(value, "%Y-%m-%d")
+    delta = datetime.now() - date
+    return delta.days
+
+
+# All time expressions in one alternation, so the query is scanned once and the
+# leftmost expression wins. Only the parameterized alternatives are named
+# groups: plain literal branches let the regex engine skip ahead to candidate
+# first characters, which is what keeps the single pass cheap.
+_TIME_RE = re.compile(
+    r"last (?P<days>\d+) days?"
+    r"|past (?P<weeks>\d+) weeks?"
+    r"|last (?P<hours>\d+) hours?"
+    r"|since (?P<date>\d{4}-\d{2}-\d{2})"
+    r"|today|yesterday|this week|last week"
+)
+
+# Dispatch on match.lastgroup for parameterized expressions...
+_TIME_PARSERS = {
+    "days": _parse_days,
+    "weeks": _parse_weeks,
+    "hours": _parse_hours,
+    "date": _parse_date,
+}
+
+# ...and on the matched text for fixed ones
+_FIXED_TIME_DAYS = {"today": 1, "yesterday": 1, "this week": 7, "last week": 14}
+
+
+# Keyword -> query type and keyword -> status, inverted once at import. Dicts
+# keep insertion order, so keywords are tried in the original priority order
+# and the first keyword found in the query decides.
+_KEYWORD_TO_TYPE = {
+    keyword: query_type
+    for query_type, keywords in (
+        (QueryType.FLAKY_ANALYSIS, ("flaky", "unstable", "intermittent")),
+        (QueryType.OWNER_QUERY, ("owner", "owned by", "who owns")),
+        (QueryType.STATISTICS, ("statistics", "summary", "report")),
+        (QueryType.HISTORY_QUERY, ("history", "trend", "over time")),
+        (QueryType.PLATFORM_SPECIFIC, ("platform", "aws", "gcp", "azure")),
+        (QueryType.STATUS_CHECK, ("status", "failed", "passed")),
+    )
+    for keyword in keywords
+}
+
+_KEYWORD_TO_STATUS = {
+    keyword: status
+    for status, keywords in (
+        ("failed", ("failed", "failure", "failing", "broken")),
+        ("passed", ("passed", "passing", "successful", "green")),
+        ("skipped", ("skipped", "skip", "ignored")),
+        ("all", ("all", "any", "every")),
+    )
+    for keyword in keywords
+}
+
+_AGGREGATION_KEYWORDS = (
+    "how many",
+    "count",
+    "total",
+    "average",
+    "mean",
+    "distribution",
+    "percentage",
+    "rate",
+    "top",
+    "most",
+)
+
+_PLATFORM_RE = re.compile(r"\b(aws|gcp|azure|vsphere|openstack)\b")
+_OWNER_RE = re.compile(r"owned by (\w+)")
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+_TEST_NAME_RE = re.compile(r"test_\w+")
+
+
 class QueryProcessor:
     """Process natural language queries to extract intent and parameters."""
 
     def __init__(self):
-        self.time_patterns = {
-            r"last (\d+) days?": self._parse_days,
-            r"past (\d+) weeks?": self._parse_weeks,
-            r"last (\d+) hours?": self._parse_hours,
-            r"since (\d{4}-\d{2}-\d{2})": self._parse_date,
-            r"today": lambda _: 1,
-            r"yesterday": lambda _: 1,
-            r"this week": lambda _: 7,
-            r"last week": lambda _: 14,
-        }
-
-        self.status_keywords = {
-            "failed": ["failed", "failure", "failing", "broken"],
-            "passed": ["passed", "passing", "successful", "green"],
-            "skipped": ["skipped", "skip", "ignored"],
-            "all": ["all", "any", "every"],
-        }
+        # Identical queries are common in chat sessions; intents are frozen so
+        # cached instances can be shared safely
+        self._process_query_cached = functools.lru_cache(maxsize=1024)(self._process_query)
 
     def process_query(self, query: str) -> QueryIntent:
         """Extract intent and parameters from natural language query."""
+        # "since <date>" becomes a day count relative to today, which a cached
+        # intent would keep serving after the date rolls over
+        if "since" in query.lower():
+            return self._process_query(query)
+        return self._process_query_cached(query)
+
+    def _process_query(self, query: str) -> QueryIntent:
+        """Parse a query into an intent; see process_query."""
         query_lower = query.lower()
 
         # Determine query type
@@ -53,94 +135,55 @@ class QueryProcessor:
 
     def _identify_query_type(self, query: str) -> QueryType:
         """Identify the type of query."""
-        if any(word in query for word in ["flaky", "unstable", "intermittent"]):
-            return QueryType.FLAKY_ANALYSIS
-        elif any(word in query for word in ["owner", "owned by", "who owns"]):
-            return QueryType.OWNER_QUERY
-        elif any(word in query for word in ["statistics", "summary", "report"]):
-            return QueryType.STATISTICS
-        elif any(word in query for word in ["history", "trend", "over time"]):
-            return QueryType.HISTORY_QUERY
-        elif any(word in query for word in ["platform", "aws", "gcp", "azure"]):
-            return QueryType.PLATFORM_SPECIFIC
-        elif any(word in query for word in ["status", "failed", "passed"]):
-            return QueryType.STATUS_CHECK
-        else:
-            return QueryType.GENERAL
+        for keyword, query_type in _KEYWORD_TO_TYPE.items():
+            if keyword in query:
+                return query_type
+        return QueryType.GENERAL
 
     def _extract_filters(self, query: str) -> FilterCriteria:
         """Extract filter criteria from query."""
-        filters = FilterCriteria()
+        criteria = {}
 
         # Extract time filter
-        for pattern, parser in self.time_patterns.items():
-            match = re.search(pattern, query)
-            if match:
-                days_back = parser(match)
-                filters.time_filter = TimeFilter(days_back=days_back)
-                break
+        match = _TIME_RE.search(query)
+        if match:
+            group = match.lastgroup
+            if group:
+                days_back = _TIME_PARSERS[group](match[group])
+            else:
+                days_back = _FIXED_TIME_DAYS[match[0]]
+            criteria["time_filter"] = TimeFilter(days_back=days_back)
 
         # Extract status filter
-        for status, keywords in self.status_keywords.items():
-            if any(keyword in query for keyword in keywords):
-                filters.status = status
+        for keyword, status in _KEYWORD_TO_STATUS.items():
+            if keyword in query:
+                criteria["status"] = status
                 break
 
         # Extract platform
-        platforms = ["aws", "gcp", "azure", "vsphere", "openstack"]
-        for platform in platforms:
-            if platform in query:
-                filters.platform = platform
-                break
+        platform_match = _PLATFORM_RE.search(query)
+        if platform_match:
+            criteria["platform"] = platform_match.group(1)
 
         # Extract owner
-        owner_match = re.search(r"owned by (\w+)", query)
+        owner_match = _OWNER_RE.search(query)
         if owner_match:
-            filters.owner = owner_match.group(1)
+            criteria["owner"] = owner_match.group(1)
 
-        return filters
+        return FilterCriteria(**criteria)
 
     def _extract_test_names(self, query: str) -> List[str]:
         """Extract specific test names from query."""
-        # Look for quoted test names
-        quoted_tests = re.findall(r'"([^"]+)"', query)
-
-        # Look for test patterns (e.g., test_something)
-        test_patterns = re.findall(r"test_\w+", query)
+        # Quoted test names first, then test patterns (e.g., test_something);
+        # dict keys drop duplicates while keeping first-occurrence order
+        test_names = dict.fromkeys(_QUOTED_RE.findall(query))
+        test_names.update(dict.fromkeys(_TEST_NAME_RE.findall(query)))
 
-        return list(set(quoted_tests + test_patterns))
+        return list(test_names)
 
     def _requires_aggregation(self, query: str) -> bool:
         """Determine if query requires aggregation."""
-        aggregation_keywords = [
-            "how many",
-            "count",
-            "total",
-            "average",
-            "mean",
-            "distribution",
-            "percentage",
-            "rate",
-            "top",
-            "most",
-        ]
-        return any(keyword in query for keyword in aggregation_keywords)
-
-    @staticmethod
-    def _parse_days(match) -> int:
-        return int(match.group(1))
-
-    @staticmethod
-    def _parse_weeks(match) -> int:
-        return int(match.group(1)) * 7
-
-    @staticmethod
-    def _parse_hours(match) -> int:
-        return 1  # Convert to days
-
-    @staticmethod
-    def _parse_date(match) -> int:
-        date_str = match.group(1)
-        date = datetime.strptime(date_str, "%Y-%m-%d")
-        delta = datetime.now() - date
-        return delta.days
+        for keyword in _AGGREGATION_KEYWORDS:
+            if keyword in query:
+                return True
+        return False
@@ -1,8 +1,8 @@
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class QueryType(Enum):
@@ -16,20 +16,42 @@ class QueryType(Enum):
 
 
 class TimeFilter(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     days_back: int = 7
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
 
 
 class FilterCriteria(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     time_filter: Optional[TimeFilter] = None
     status: Optional[str] = None
     platform: Optional[str] = None
     owner: Optional[str] = None
     tags: List[str] = Field(default_factory=list)
 
+    def fingerprint(self) -> Tuple:
+        """Return a hashable tuple identifying these filters without a model dump."""
+        time_filter = self.time_filter
+        return (
+            (
+                (time_filter.days_back, time_filter.start_date, time_filter.end_date)
+                if time_filter
+                else None
+            ),
+            self.status,
+            self.platform,
+            self.owner,
+            tuple(self.tags),
+        )
+
 
 class QueryIntent(BaseModel):
+    # Intents are cached by QueryProcessor and shared between callers
+    model_config = ConfigDict(frozen=True)
+
     original_query: str
     query_type: QueryType
     filters: FilterCriteria
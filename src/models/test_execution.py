@@ -1,7 +1,8 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import cached_property
 from typing import Any, Dict, List, Optional, Union
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, TypeAdapter, field_validator
 
 
 class TestIssue(BaseModel):
@@ -59,15 +60,18 @@ class TestExecution(BaseModel):
             return int(v)
         return v
 
-    @property
+    # Computed on first access; timestamps are not reassigned after validation
+    @cached_property
     def duration(self) -> Optional[float]:
         if self.endTime and self.startTime:
             return (self.endTime - self.startTime) / 1000.0
         return None
 
-    @property
+    @cached_property
     def start_datetime(self) -> datetime:
-        return datetime.fromtimestamp(self.startTime / 1000)
+        # Split the millisecond epoch with integer math to avoid float rounding
+        seconds, millis = divmod(self.startTime, 1000)
+        return datetime.fromtimestamp(seconds, tz=timezone.utc).replace(microsecond=millis * 1000)
 
 
 class Launch(BaseModel):
@@ -109,3 +113,8 @@ class Launch(BaseModel):
         if v is not None:
             return int(v)
         return v
+
+
+# Validate a whole page of API content in one call rather than item by item
+TEST_EXECUTIONS_ADAPTER = TypeAdapter(List[TestExecution])
+LAUNCHES_ADAPTER = TypeAdapter(List[Launch])
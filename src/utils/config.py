@@ -1,16 +1,37 @@
+import functools
+import json
 import os
+import stat
 from pathlib import Path
 from typing import Any, Dict, Optional
 
 import yaml
 from pydantic import BaseModel, Field
 
+_ENV_MAPPINGS = {
+    "REPORTPORTAL_URL": ("reportportal", "base_url"),
+    "REPORTPORTAL_PROJECT": ("reportportal", "project"),
+    "REPORTPORTAL_TOKEN": ("reportportal", "auth_token"),
+    "LLM_PROVIDER": ("llm", "provider"),
+    "LLM_MODEL": ("llm", "model_name"),
+    "LLM_API_KEY": ("llm", "api_key"),
+    "OPENAI_API_KEY": ("llm", "api_key"),
+}
+
+# The environment is read once at import; later entries win on conflicts
+_ENV_OVERRIDES = tuple(
+    (section, key, value)
+    for env_var, (section, key) in _ENV_MAPPINGS.items()
+    if (value := os.getenv(env_var))
+)
+
 
 class ReportPortalConfig(BaseModel):
     base_url: str = Field(default="https://localhost:8080")
     project: str = Field(default="default_personal")
     auth_token: str = Field(default="")
     verify_ssl: bool = Field(default=False)
+    max_concurrent_fetches: int = Field(default=5)
 
 
 class LLMConfig(BaseModel):
@@ -22,12 +43,16 @@ class LLMConfig(BaseModel):
     max_tokens: int = Field(default=2000)
     context_length: int = Field(default=4096)
     gpu_layers: int = Field(default=0)
+    device: Optional[str] = Field(default=None)
 
 
 class CacheConfig(BaseModel):
     enabled: bool = Field(default=True)
     directory: str = Field(default="./cache")
     ttl_hours: int = Field(default=24)
+    # Read pickle blobs from caches written before msgpack; unpickling can run
+    # arbitrary code, so enable only for trusted cache directories
+    allow_legacy_pickle: bool = Field(default=False)
 
 
 class PathConfig(BaseModel):
@@ -47,36 +72,80 @@ class Config(BaseModel):
         """Load configuration from YAML file."""
         config_file = Path(config_path)
 
-        if not config_file.exists():
+        try:
+            config_stat = config_file.stat()
+        except FileNotFoundError:
             # Return default config if file doesn't exist
             return cls()
 
-        with open(config_file, "r") as f:
-            config_data = yaml.safe_load(f)
+        config_data = _load_config_data(
+            str(config_file), config_stat.st_mtime_ns, config_stat.st_size
+        )
 
         # Override with environment variables if present
         config_data = cls._override_with_env(config_data)
 
-        return cls(**config_data)
+        return cls.model_validate(config_data)
+
+    @staticmethod
+    def _load_yaml_cached(config_file: Path) -> Dict[str, Any]:
+        """Load YAML data, reusing a JSON sidecar while the YAML is unchanged."""
+        cache_file = config_file.with_suffix(".yaml.json")
+        config_stat = config_file.stat()
+
+        # The sidecar records the exact mtime and size of the YAML it was built
+        # from; a newer sidecar is not enough, as copies can carry older mtimes
+        try:
+            with open(cache_file, "r") as f:
+                cached = json.load(f)
+            if (
+                cached["mtime_ns"] == config_stat.st_mtime_ns
+                and cached["size"] == config_stat.st_size
+            ):
+                return cached["data"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        with open(config_file, "r") as f:
+            config_data = yaml.load(f, Loader=loader) or {}  # nosec B506
+
+        sidecar = {
+            "mtime_ns": config_stat.st_mtime_ns,
+            "size": config_stat.st_size,
+            "data": config_data,
+        }
+
+        # Write atomically so a concurrent reader never sees a partial file. The
+        # sidecar holds the same secrets as the YAML, so it is created private
+        # and given the YAML's permissions before it becomes visible.
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with open(fd, "w") as f:
+                json.dump(sidecar, f)
+            os.chmod(tmp_file, stat.S_IMODE(config_stat.st_mode))
+            os.replace(tmp_file, cache_file)
+        except (OSError, TypeError, ValueError):
+            tmp_file.unlink(missing_ok=True)
+
+        return config_data
 
     @staticmethod
     def _override_with_env(config_data: Dict[str, Any]) -> Dict[str, Any]:
         """Override config values with environment variables."""
-        env_mappings = {
-            "REPORTPORTAL_URL": ("reportportal", "base_url"),
-            "REPORTPORTAL_PROJECT": ("reportportal", "project"),
-            "REPORTPORTAL_TOKEN": ("reportportal", "auth_token"),
-            "LLM_PROVIDER": ("llm", "provider"),
-            "LLM_MODEL": ("llm", "model_name"),
-            "LLM_API_KEY": ("llm", "api_key"),
-            "OPENAI_API_KEY": ("llm", "api_key"),
-        }
+        if not _ENV_OVERRIDES:
+            return config_data
 
-        for env_var, (section, key) in env_mappings.items():
-            value = os.getenv(env_var)
-            if value:
-                if section not in config_data:
-                    config_data[section] = {}
-                config_data[section][key] = value
+        # Copy on write: config_data may be shared with the parse cache
+        config_data = dict(config_data)
+        for section, key, value in _ENV_OVERRIDES:
+            config_data[section] = {**config_data.get(section, {}), key: value}
 
         return config_data
+
+
+@functools.lru_cache(maxsize=16)
+def _load_config_data(config_path: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    """Parse a config file once per modification time and size within this process."""
+    return Config._load_yaml_cached(Path(config_path))
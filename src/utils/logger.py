@@ -1,43 +1,61 @@
+import logging
 import sys
+from logging.handlers import TimedRotatingFileHandler
 from pathlib import Path
 
-from loguru import logger
-
 from .config import Config
 
+# The console shows the logger name only; the files also record the caller
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+_CONSOLE_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s - %(message)s"
+_FILE_FORMAT = "%(asctime)s | %(levelname)-8s | %(name)s:%(funcName)s:%(lineno)d - %(message)s"
+
+# Top-level package whose loggers get DEBUG; everything else stays at WARNING
+_APP_LOGGER_NAME = __name__.partition(".")[0]
+
 
 def setup_logger(config: Config):
-    """Configure loguru logger."""
-    # Remove default handler
-    logger.remove()
+    """Configure logging for the application.
+
+    Handlers live on the root logger so warnings from libraries still reach
+    the console and files, but only the application's own loggers are opened
+    up to DEBUG. Libraries such as httpx, httpcore and h2 log per request and
+    per frame at DEBUG, and formatting those records would put file I/O on
+    every Report Portal call.
+    """
+    root = logging.getLogger()
+    root.setLevel(logging.WARNING)
+    logging.getLogger(_APP_LOGGER_NAME).setLevel(logging.DEBUG)
+
+    # Remove handlers left over from a previous call
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
 
     # Create logs directory
     logs_dir = Path(config.paths.logs_dir)
     logs_dir.mkdir(exist_ok=True)
 
     # Console handler
-    logger.add(
-        sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
-        level="INFO",
-    )
-
-    # File handler for all logs
-    logger.add(
-        logs_dir / "app.log",
-        rotation="1 day",
-        retention="7 days",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="DEBUG",
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(logging.INFO)
+    console.setFormatter(logging.Formatter(_CONSOLE_FORMAT, _DATE_FORMAT))
+    root.addHandler(console)
+
+    # File handler for all logs, rotated daily and kept for a week
+    app_log = TimedRotatingFileHandler(
+        logs_dir / "app.log", when="D", backupCount=7, encoding="utf-8"
     )
+    app_log.setLevel(logging.DEBUG)
+    app_log.setFormatter(logging.Formatter(_FILE_FORMAT, _DATE_FORMAT))
+    root.addHandler(app_log)
 
-    # File handler for errors
-    logger.add(
-        logs_dir / "errors.log",
-        rotation="1 week",
-        retention="1 month",
-        format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
-        level="ERROR",
+    # File handler for errors, rotated weekly and kept for about a month
+    error_log = TimedRotatingFileHandler(
+        logs_dir / "errors.log", when="W0", backupCount=4, encoding="utf-8"
     )
+    error_log.setLevel(logging.ERROR)
+    error_log.setFormatter(logging.Formatter(_FILE_FORMAT, _DATE_FORMAT))
+    root.addHandler(error_log)
 
-    logger.info("Logger initialized")
+    logging.getLogger(__name__).info("Logger initialized")
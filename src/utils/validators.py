@@ -1,7 +1,80 @@
+import functools
 import re
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Tuple
-from urllib.parse import urlparse
+from enum import Enum
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Potential injection attempts, checked against the lowercased query. Fixed
+# markers are plain substring tests; only calls, which allow whitespace before
+# the parenthesis, need the regex engine.
+_DANGEROUS_SUBSTRINGS = ("<script", "javascript:", "__import__")
+_DANGEROUS_CALL_RE = re.compile(r"(?:exec|eval)\s*\(")
+
+# An http(s) scheme followed by a non-empty host and no whitespace
+_URL_RE = re.compile(r"https?://[^\s/$.?#][^\s]*", re.IGNORECASE)
+
+# Every accepted spelling mapped straight to its canonical platform name
+_PLATFORM_ALIASES = MappingProxyType(
+    {
+        alias: platform
+        for platform, aliases in (
+            ("aws", ("aws", "amazon", "amazon web services", "ec2")),
+            ("gcp", ("gcp", "google", "google cloud", "gce")),
+            ("azure", ("azure", "microsoft", "microsoft azure")),
+            ("vsphere", ("vsphere", "vmware")),
+            ("openstack", ("openstack",)),
+        )
+        for alias in aliases
+    }
+)
+
+# Status spellings mapped straight to Report Portal status values
+_STATUS_ALIASES = MappingProxyType(
+    {
+        alias: status
+        for status, aliases in (
+            ("PASSED", ("passed", "pass", "passing", "success", "successful", "green", "ok")),
+            ("FAILED", ("failed", "fail", "failing", "failure", "broken", "red")),
+            ("SKIPPED", ("skipped", "skip", "ignored")),
+            ("INTERRUPTED", ("interrupted", "stopped", "aborted")),
+        )
+        for alias in aliases
+    }
+)
+
+# Non-ISO date formats accepted by DateTimeValidator, tried in order
+_DATETIME_FORMATS = ("%d/%m/%Y", "%d-%m-%Y", "%Y-%m-%d %H:%M:%S")
+
+# Relative dates, resolved against a single datetime.now() per call
+_RELATIVE_DATES = {
+    "today": lambda now: now,
+    "yesterday": lambda now: now - timedelta(days=1),
+    "tomorrow": lambda now: now + timedelta(days=1),
+}
+_DAYS_AGO_RE = re.compile(r"(\d+) days? ago")
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_absolute_datetime(value: str) -> Optional[datetime]:
+    """Parse an absolute date; results do not depend on the clock, so they are cached."""
+    # ISO 8601 dates and datetimes take the C parser, far cheaper than strptime
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        pass
+
+    for date_format in _DATETIME_FORMATS:
+        try:
+            return datetime.strptime(value, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+# C0 control characters and DEL, except tab, newline and carriage return, mapped
+# to None for str.translate
+_CONTROL_CHARS = dict.fromkeys([*(c for c in range(32) if c not in (9, 10, 13)), 127])
 
 
 class URLValidator:
@@ -9,21 +82,35 @@ class URLValidator:
 
     @staticmethod
     def validate_url(url: str) -> bool:
-        """Check if URL is valid."""
-        try:
-            result = urlparse(url)
-            return all([result.scheme, result.netloc])
-        except ValueError:
-            return False
+        """Check if URL is a well-formed http or https URL."""
+        return _URL_RE.fullmatch(url) is not None
+
+    @staticmethod
+    def validate_urls(urls: Iterable[str]) -> List[bool]:
+        """Check several URLs, binding the matcher once for the whole batch."""
+        fullmatch = _URL_RE.fullmatch
+        return [fullmatch(url) is not None for url in urls]
 
     @staticmethod
     def normalize_url(url: str) -> str:
         """Normalize URL by ensuring proper format."""
-        if not url.startswith(("http://", "https://")):
-            url = "http://" + url
+        # Strip before prefixing so at most one new string is built; rstrip
+        # returns url itself when there is no trailing slash
+        if url.startswith(("http://", "https://")):
+            return url.rstrip("/")
+        return "http://" + url.rstrip("/")
 
-        # Remove trailing slash
-        return url.rstrip("/")
+
+class QueryError(str, Enum):
+    """Reasons a query fails validation; each value is its user-facing message."""
+
+    EMPTY = "Query cannot be empty"
+    TOO_SHORT = "Query too short. Minimum 3 characters required"
+    TOO_LONG = "Query too long. Maximum 1000 characters allowed"
+    UNSAFE = "Query contains potentially unsafe content"
+
+    def __str__(self) -> str:
+        return self.value
 
 
 class QueryValidator:
@@ -32,37 +119,96 @@ class QueryValidator:
     MAX_QUERY_LENGTH = 1000
     MIN_QUERY_LENGTH = 3
 
+    # Results are built once; every call returns one of these shared tuples
+    _VALID = (True, None)
+    _EMPTY = (False, QueryError.EMPTY)
+    _TOO_SHORT = (False, QueryError.TOO_SHORT)
+    _TOO_LONG = (False, QueryError.TOO_LONG)
+    _UNSAFE = (False, QueryError.UNSAFE)
+
+    @staticmethod
+    def validate_query(query: str) -> Tuple[bool, Optional[QueryError]]:
+        """Validate user query and return (is_valid, error)"""
+        query = query.strip() if query else ""
+        length = len(query)
+
+        if not length:
+            return QueryValidator._EMPTY
+        if length < QueryValidator.MIN_QUERY_LENGTH:
+            return QueryValidator._TOO_SHORT
+        if length > QueryValidator.MAX_QUERY_LENGTH:
+            return QueryValidator._TOO_LONG
+
+        # Check for potential injection attempts
+        query_lower = query.lower()
+        if any(marker in query_lower for marker in _DANGEROUS_SUBSTRINGS):
+            return QueryValidator._UNSAFE
+        if _DANGEROUS_CALL_RE.search(query_lower):
+            return QueryValidator._UNSAFE
+
+        return QueryValidator._VALID
+
+
+class PlatformValidator:
+    """Validate and normalize platform names."""
+
     @staticmethod
-    def validate_query(query: str) -> Tuple[bool, Optional[str]]:
-        """Validate user query and return (is_valid, error_message)"""
-        if not query or not query.strip():
-            return False, "Query cannot be empty"
+    def normalize_platform(platform: str) -> Optional[str]:
+        """Return the canonical platform name, or None if it is not recognized."""
+        return _PLATFORM_ALIASES.get(platform.strip().lower())
 
-        query = query.strip()
+    @staticmethod
+    def normalize_platforms(platforms: Iterable[str]) -> List[Optional[str]]:
+        """Normalize several platform names, binding the lookup once for the whole batch."""
+        lookup = _PLATFORM_ALIASES.get
+        return [lookup(platform.strip().lower()) for platform in platforms]
 
-        if len(query) < QueryValidator.MIN_QUERY_LENGTH:
-            return (
-                False,
-                f"Query too short. Minimum {QueryValidator.MIN_QUERY_LENGTH} characters required",
-            )
+    @staticmethod
+    def is_valid_platform(platform: str) -> bool:
+        """Check if platform is a known platform or alias."""
+        return platform.strip().lower() in _PLATFORM_ALIASES
 
-        if len(query) > QueryValidator.MAX_QUERY_LENGTH:
-            return (
-                False,
-                f"Query too long. Maximum {QueryValidator.MAX_QUERY_LENGTH} characters allowed",
-            )
 
-        # Check for potential injection attempts
-        dangerous_patterns = [
-            r"<script",
-            r"javascript:",
-            r"exec\s*\(",
-            r"eval\s*\(",
-            r"__import__",
-        ]
-
-        for pattern in dangerous_patterns:
-            if re.search(pattern, query, re.IGNORECASE):
-                return False, "Query contains potentially unsafe content"
-
-        return True, None
+class StatusValidator:
+    """Validate and normalize test statuses."""
+
+    @staticmethod
+    def normalize_status(status: str) -> Optional[str]:
+        """Return the Report Portal status, or None if it is not recognized."""
+        return _STATUS_ALIASES.get(status.strip().lower())
+
+
+class DateTimeValidator:
+    """Parse user supplied dates."""
+
+    @staticmethod
+    def parse_datetime(value: str) -> Optional[datetime]:
+        """Parse an absolute or relative date, returning None if it is not recognized."""
+        value = value.strip()
+
+        # Relative dates depend on the current time and are never cached
+        keyword = value.lower()
+        relative = _RELATIVE_DATES.get(keyword)
+        if relative is not None:
+            return relative(datetime.now())
+
+        days_ago = _DAYS_AGO_RE.fullmatch(keyword)
+        if days_ago:
+            return datetime.now() - timedelta(days=int(days_ago.group(1)))
+
+        return _parse_absolute_datetime(value)
+
+
+def sanitize_string(text: str, max_length: int = 1000) -> str:
+    """Remove control characters and truncate text to max_length, adding an ellipsis."""
+    # Removing characters only shortens text, so if a prefix still overflows
+    # once cleaned, the rest of a long input never needs scanning
+    if len(text) > 2 * max_length:
+        head = text[: 2 * max_length].translate(_CONTROL_CHARS)
+        if len(head) > max_length:
+            return head[:max_length] + "..."
+
+    text = text.translate(_CONTROL_CHARS)
+    if len(text) > max_length:
+        return text[:max_length] + "..."
+    return text
@@ -1,25 +1,12 @@
-import asyncio
-import shutil
 from pathlib import Path
 
 import pytest
 
 
-@pytest.fixture(scope="session")
-def event_loop():
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
 def temp_dir(tmp_path):
-    """Create a temporary directory for test files."""
-    yield tmp_path
-    # Cleanup
-    if tmp_path.exists():
-        shutil.rmtree(tmp_path)
+    """Create a temporary directory for test files; pytest prunes old tmp_path dirs."""
+    return tmp_path
 
 
 @pytest.fixture
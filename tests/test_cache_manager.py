@@ -0,0 +1,132 @@
+import pickle
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.data_access.cache_manager import CacheManager, pack_value, unpack_value
+from src.models.test_execution import Launch, TestExecution, TestIssue
+
+
+@pytest.fixture
+def cache_manager(test_config):
+    manager = CacheManager(test_config)
+    yield manager
+    manager.close()
+
+
+class TestPackValue:
+    def test_datetime_round_trip(self):
+        value = datetime(2024, 1, 15, 10, 30, 5, 123456)
+        assert unpack_value(pack_value(value)) == value
+
+    def test_ndarray_round_trip(self):
+        value = np.arange(12, dtype=np.float32).reshape(3, 4)
+        result = unpack_value(pack_value(value))
+        assert result.dtype == value.dtype
+        np.testing.assert_array_equal(result, value)
+
+    @pytest.mark.parametrize(
+        "model",
+        [
+            TestIssue(issueType="PRODUCT_BUG", comment="timeout"),
+            TestExecution(
+                id="item1",
+                name="test_example",
+                type="TEST",
+                startTime=1640000000000,
+                status="FAILED",
+                launchId="launch1",
+                attributes={"platform": "aws"},
+                issue=TestIssue(comment="timeout"),
+            ),
+            Launch(
+                id="launch1",
+                uuid="uuid1",
+                name="Launch",
+                number=1,
+                startTime=1640000000000,
+                status="PASSED",
+            ),
+        ],
+    )
+    def test_model_round_trip(self, model):
+        result = unpack_value(pack_value([model]))
+        assert type(result[0]) is type(model)
+        assert result[0] == model
+
+    def test_legacy_pickle_requires_opt_in(self):
+        blob = pickle.dumps({"legacy": [1, 2]})
+
+        with pytest.raises(ValueError):
+            unpack_value(blob)
+        assert unpack_value(blob, allow_pickle=True) == {"legacy": [1, 2]}
+
+
+class TestCacheManager:
+    def test_set_and_get(self, cache_manager):
+        cache_manager.set("key", {"value": 1})
+        assert cache_manager.get("key") == {"value": 1}
+        assert cache_manager.get("missing") is None
+
+    def test_legacy_pickle_entry_is_a_miss_unless_allowed(self, test_config):
+        manager = CacheManager(test_config)
+        manager._write_rows(
+            [
+                (
+                    "legacy",
+                    pickle.dumps("old"),
+                    datetime.now(),
+                    datetime(9999, 1, 1),
+                )
+            ]
+        )
+        assert manager.get("legacy") is None
+        manager.close()
+
+        test_config.cache.allow_legacy_pickle = True
+        manager = CacheManager(test_config)
+        try:
+            assert manager.get("legacy") == "old"
+        finally:
+            manager.close()
+
+    def test_set_many(self, cache_manager):
+        cache_manager.set_many({"a": 1, "b": [2, 3]})
+        assert cache_manager.get("a") == 1
+        assert cache_manager.get("b") == [2, 3]
+
+    @pytest.mark.asyncio
+    async def test_aset_is_persisted_after_flush(self, cache_manager):
+        for i in range(5):
+            await cache_manager.aset(f"key{i}", i)
+
+        await cache_manager.flush()
+
+        assert [cache_manager.get(f"key{i}") for i in range(5)] == list(range(5))
+
+    @pytest.mark.asyncio
+    async def test_close_drains_queued_writes(self, test_config):
+        manager = CacheManager(test_config)
+        await manager.aset("a", "first")
+        await manager.aset("b", "second")
+
+        # Close before the background writer has had a chance to run
+        manager.close()
+
+        reopened = CacheManager(test_config)
+        try:
+            assert reopened.get("a") == "first"
+            assert reopened.get("b") == "second"
+        finally:
+            reopened.close()
+
+    @pytest.mark.asyncio
+    async def test_writer_keeps_running_after_flush(self, cache_manager):
+        await cache_manager.aset("a", 1)
+        await cache_manager.flush()
+        await cache_manager.aset("b", 2)
+        await cache_manager.flush()
+
+        assert cache_manager.get("a") == 1
+        assert cache_manager.get("b") == 2
@@ -0,0 +1,54 @@
+import json
+import os
+import stat
+
+import pytest
+
+from src.utils.config import Config
+
+CONFIG_YAML = """\
+reportportal:
+  base_url: "http://rp.example.com"
+  auth_token: "{token}"
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+    path = tmp_path / "config.yaml"
+    path.write_text(CONFIG_YAML.format(token="old-token"))
+    os.chmod(path, 0o600)
+    return path
+
+
+class TestConfigSidecar:
+    def test_sidecar_keeps_config_permissions(self, config_file):
+        Config.from_yaml(str(config_file))
+
+        sidecar = config_file.with_suffix(".yaml.json")
+        assert sidecar.exists()
+        assert stat.S_IMODE(sidecar.stat().st_mode) == 0o600
+
+    def test_replaced_config_with_older_mtime_is_reloaded(self, config_file, tmp_path):
+        assert Config.from_yaml(str(config_file)).reportportal.auth_token == "old-token"
+
+        # Replace the file the way cp -p or a restored backup would: new
+        # content carrying a modification time older than the sidecar's
+        replacement = tmp_path / "replacement.yaml"
+        replacement.write_text(CONFIG_YAML.format(token="new-token-value"))
+        os.utime(replacement, ns=(1_000_000_000, 1_000_000_000))
+        os.replace(replacement, config_file)
+
+        assert Config.from_yaml(str(config_file)).reportportal.auth_token == "new-token-value"
+
+    def test_unchanged_config_is_served_from_sidecar(self, config_file):
+        Config.from_yaml(str(config_file))
+
+        # Mark the sidecar's data so a hit is distinguishable from a re-parse
+        sidecar = config_file.with_suffix(".yaml.json")
+        cached = json.loads(sidecar.read_text())
+        cached["data"]["reportportal"]["auth_token"] = "from-sidecar"
+        sidecar.write_text(json.dumps(cached))
+
+        data = Config._load_yaml_cached(config_file)
+        assert data["reportportal"]["auth_token"] == "from-sidecar"
@@ -0,0 +1,100 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from src.llm_integration import embeddings_manager as embeddings_module  # noqa: E402
+from src.llm_integration.embeddings_manager import EmbeddingsManager  # noqa: E402
+from src.models.test_execution import TestExecution  # noqa: E402
+
+
+@pytest.fixture
+def embeddings_manager(test_config):
+    manager = EmbeddingsManager(test_config)
+    yield manager
+    manager.close()
+
+
+def make_test(test_id, name="test_example", comment=None):
+    return TestExecution(
+        id=test_id,
+        name=name,
+        type="TEST",
+        startTime=1640000000000,
+        status="FAILED",
+        launchId="launch1",
+        issue={"comment": comment} if comment else None,
+    )
+
+
+class TestEmbeddingsCache:
+    def test_legacy_key_is_only_hashed_on_a_miss(self, embeddings_manager):
+        test = make_test("t1")
+        text = embeddings_manager._create_test_text(test)
+        embedding = np.arange(4, dtype=np.float32)
+        embeddings_manager._save_to_cache(EmbeddingsManager._legacy_cache_key(text), embedding)
+        embeddings_manager.get_batch_embeddings = MagicMock()
+
+        with patch.object(
+            EmbeddingsManager, "_legacy_cache_key", wraps=EmbeddingsManager._legacy_cache_key
+        ) as legacy_key:
+            # The first lookup misses the new key and migrates the legacy entry
+            first = embeddings_manager.create_test_embeddings([test])
+            assert legacy_key.call_count == 1
+
+            # Afterwards the new key hits and the legacy key is never computed
+            second = embeddings_manager.create_test_embeddings([test])
+            assert legacy_key.call_count == 1
+
+        np.testing.assert_array_equal(first["t1"], embedding)
+        np.testing.assert_array_equal(second["t1"], embedding)
+        embeddings_manager.get_batch_embeddings.assert_not_called()
+
+    def test_instances_sharing_a_directory_do_not_overwrite_rows(self, test_config, monkeypatch):
+        # A tiny initial capacity makes the first instance grow the file while
+        # the second still has the old size mapped
+        monkeypatch.setattr(embeddings_module, "_STORE_INITIAL_CAPACITY", 2)
+        first = EmbeddingsManager(test_config)
+        second = EmbeddingsManager(test_config)
+        vectors = {key: np.full(4, i, dtype=np.float32) for i, key in enumerate("abcdef")}
+
+        try:
+            first._save_to_cache("a", vectors["a"])
+            second._save_to_cache("b", vectors["b"])
+            for key in "cde":
+                first._save_to_cache(key, vectors[key])
+            second._save_to_cache("f", vectors["f"])
+
+            store_rows = first._store_file.stat().st_size // (4 * 4)
+            assert store_rows >= len(vectors)
+            for manager in (first, second):
+                for key, vector in vectors.items():
+                    np.testing.assert_array_equal(manager._load_from_cache(key), vector)
+        finally:
+            first.close()
+            second.close()
+
+        reopened = EmbeddingsManager(test_config)
+        try:
+            assert sorted(reopened._index.values()) == list(range(len(vectors)))
+        finally:
+            reopened.close()
+
+
+class TestClusterSimilarFailures:
+    def test_clusters_are_transitive(self, embeddings_manager):
+        # A~B and B~C at 30 degrees apart, but A and C are 60 degrees apart
+        # (cosine 0.5), below the threshold; D is far from all of them
+        angles = np.radians([0, 30, 60, 150])
+        vectors = [np.array([np.cos(a), np.sin(a)], dtype=np.float32) for a in angles]
+        embeddings_manager.get_batch_embeddings = MagicMock(return_value=vectors)
+        tests = [make_test(f"t{i}", comment=f"failure {i}") for i in range(4)]
+
+        clusters = embeddings_manager.cluster_similar_failures(tests, similarity_threshold=0.8)
+
+        assert [[test.id for test in cluster] for cluster in clusters] == [
+            ["t0", "t1", "t2"],
+            ["t3"],
+        ]
@@ -0,0 +1,46 @@
+import logging
+
+import pytest
+
+from src.utils.config import Config
+from src.utils.logger import setup_logger
+
+
+@pytest.fixture
+def configured_logging(tmp_path):
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    app_logger = logging.getLogger("src")
+    saved_app_level = app_logger.level
+
+    setup_logger(Config(paths={"logs_dir": str(tmp_path / "logs")}))
+    yield tmp_path / "logs"
+
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    for handler in saved_handlers:
+        root.addHandler(handler)
+    root.setLevel(saved_level)
+    app_logger.setLevel(saved_app_level)
+
+
+class TestSetupLogger:
+    def test_app_debug_is_written_but_library_debug_is_not(self, configured_logging):
+        logging.getLogger("src.data_access.reportportal_client").debug("app detail")
+        logging.getLogger("httpcore.http2").debug("frame detail")
+        logging.getLogger("httpx").warning("library warning")
+        for handler in logging.getLogger().handlers:
+            handler.flush()
+
+        app_log = (configured_logging / "app.log").read_text()
+        assert "app detail" in app_log
+        assert "frame detail" not in app_log
+        assert "library warning" in app_log
+
+    def test_repeated_setup_does_not_duplicate_handlers(self, configured_logging):
+        config = Config(paths={"logs_dir": str(configured_logging)})
+        setup_logger(config)
+        handlers = len(logging.getLogger().handlers)
+        setup_logger(config)
+        assert len(logging.getLogger().handlers) == handlers
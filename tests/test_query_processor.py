@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from src.llm_integration.query_processor import QueryProcessor
+from src.models.query_models import QueryType
+
+
+class TestQueryProcessor:
+    def test_extracts_filters(self):
+        intent = QueryProcessor().process_query("Show failed tests on AWS in the last 3 days")
+
+        assert intent.query_type == QueryType.PLATFORM_SPECIFIC
+        assert intent.filters.status == "failed"
+        assert intent.filters.platform == "aws"
+        assert intent.filters.time_filter.days_back == 3
+
+    def test_repeated_queries_share_cached_intent(self):
+        processor = QueryProcessor()
+        query = "Which tests are flaky this week?"
+
+        assert processor.process_query(query) is processor.process_query(query)
+
+    def test_since_queries_follow_the_clock(self):
+        processor = QueryProcessor()
+        query = "Failures since 2024-01-01"
+        today = datetime(2024, 1, 11)
+
+        with patch("src.llm_integration.query_processor.datetime") as mock_datetime:
+            mock_datetime.strptime = datetime.strptime
+            mock_datetime.now.return_value = today
+            assert processor.process_query(query).filters.time_filter.days_back == 10
+
+            # A day later the same query must cover one more day, not a cached window
+            mock_datetime.now.return_value = today + timedelta(days=1)
+            assert processor.process_query(query).filters.time_filter.days_back == 11
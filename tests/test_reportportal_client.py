@@ -1,25 +1,17 @@
+import asyncio
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import orjson
 import pytest
 
 from src.data_access.reportportal_client import ReportPortalClient
 from src.models.test_execution import Launch, TestExecution
-from src.utils.config import Config
 
 
 @pytest.fixture
-def mock_config():
-    config = MagicMock(spec=Config)
-    config.reportportal.base_url = "http://test.reportportal.com"
-    config.reportportal.project = "test_project"
-    config.reportportal.auth_token = "test_token"
-    return config
-
-
-@pytest.fixture
-def rp_client(mock_config):
-    return ReportPortalClient(mock_config)
+def rp_client(test_config):
+    return ReportPortalClient(test_config)
 
 
 class TestReportPortalClient:
@@ -46,7 +38,7 @@ class TestReportPortalClient:
 
         # Mock the HTTP client
         with patch.object(rp_client.client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value.json.return_value = mock_response
+            mock_get.return_value.content = orjson.dumps(mock_response)
             mock_get.return_value.raise_for_status = MagicMock()
 
             launches = await rp_client.get_launches()
@@ -79,7 +71,7 @@ class TestReportPortalClient:
         }
 
         with patch.object(rp_client.client, "get", new_callable=AsyncMock) as mock_get:
-            mock_get.return_value.json.return_value = mock_response
+            mock_get.return_value.content = orjson.dumps(mock_response)
             mock_get.return_value.raise_for_status = MagicMock()
 
             items = await rp_client.get_test_items("launch1")
@@ -133,8 +125,8 @@ class TestReportPortalClient:
         with patch.object(rp_client.client, "get", new_callable=AsyncMock) as mock_get:
             # Configure mock to return different responses
             mock_get.side_effect = [
-                MagicMock(json=MagicMock(return_value=mock_launches)),
-                MagicMock(json=MagicMock(return_value=mock_items)),
+                MagicMock(content=orjson.dumps(mock_launches)),
+                MagicMock(content=orjson.dumps(mock_items)),
             ]
 
             history = await rp_client.get_test_history("test_specific", days_back=7)
@@ -142,3 +134,30 @@ class TestReportPortalClient:
             assert len(history) == 1
             assert history[0].name == "test_specific"
             assert history[0].status == "PASSED"
+
+    @pytest.mark.asyncio
+    async def test_iter_pages_preserves_order_and_stops_at_total_pages(self, rp_client):
+        total_pages = 4
+        requested_pages = []
+
+        async def get_page(endpoint, params):
+            page = params["page.page"]
+            requested_pages.append(page)
+            # Later pages answer first so out-of-order completion would show up
+            await asyncio.sleep((total_pages - page) * 0.01)
+            body = {
+                "content": [{"page": page, "index": i} for i in range(2)],
+                "page": {"number": page, "totalPages": total_pages},
+            }
+            return MagicMock(content=orjson.dumps(body))
+
+        with patch.object(rp_client.client, "get", side_effect=get_page):
+            pages = [
+                content
+                async for content in rp_client._iter_pages(
+                    "/api/v1/test_project/item", {"page.page": 1}
+                )
+            ]
+
+        assert sorted(requested_pages) == [1, 2, 3, 4]
+        assert [item["page"] for content in pages for item in content] == [1, 1, 2, 2, 3, 3, 4, 4]
@@ -11,24 +11,28 @@ from src.utils.config import Config
 
 @pytest.fixture
 def mock_config():
-    config = MagicMock(spec=Config)
-    config.reportportal.base_url = "http://test.reportportal.com"
-    config.reportportal.project = "test_project"
-    config.reportportal.auth_token = "test_token"
-    config.llm.provider = "openai"
-    config.llm.model_name = "gpt-3.5-turbo"
-    config.cache.enabled = True
-    config.cache.directory = "./test_cache"
-    config.cache.ttl_hours = 1
-    return config
+    # Pydantic fields are not class attributes, so MagicMock(spec=Config) rejects them
+    return Config(
+        reportportal={
+            "base_url": "http://test.reportportal.com",
+            "project": "test_project",
+            "auth_token": "test_token",
+        },
+        llm={"provider": "openai", "model_name": "gpt-3.5-turbo"},
+        cache={"enabled": True, "directory": "./test_cache", "ttl_hours": 1},
+    )
 
 
 @pytest.fixture
 def response_generator(mock_config):
-    with patch("src.application.response_generator.ReportPortalClient"):
-        with patch("src.application.response_generator.CacheManager"):
-            with patch("src.application.response_generator.LLMInterface"):
-                return ResponseGenerator(mock_config)
+    # Components are built lazily, so the patches must stay active during the test
+    with patch("src.data_access.reportportal_client.ReportPortalClient"):
+        with patch("src.data_access.cache_manager.CacheManager"):
+            with patch("src.llm_integration.llm_interface.LLMInterface"):
+                generator = ResponseGenerator(mock_config)
+                # Cache writes are queued through the async aset()
+                generator.cache_manager.aset = AsyncMock()
+                yield generator
 
 
 class TestResponseGenerator:
@@ -94,6 +98,7 @@ class TestResponseGenerator:
 
         # Configure mocks
         response_generator.cache_manager.get = MagicMock(return_value=cached_data)
+        response_generator._fetch_relevant_data = AsyncMock()
         response_generator.llm_interface.generate_response = AsyncMock(
             return_value="Found cached test result"
         )
@@ -115,8 +120,9 @@ class TestResponseGenerator:
                 yield chunk
 
         # Configure mocks
+        response_generator.cache_manager.get = MagicMock(return_value=None)
         response_generator._fetch_relevant_data = AsyncMock(return_value=[])
-        response_generator.llm_interface.generate_response = mock_stream
+        response_generator.llm_interface.generate_streaming_response = mock_stream
 
         # Execute
         chunks = []
@@ -126,3 +132,42 @@ class TestResponseGenerator:
         # Assertions
         assert len(chunks) == 3
         assert "".join(chunks) == "Finding failed tests..."
+        # The fetched data is cached for the next query
+        response_generator.cache_manager.aset.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_streaming_response_with_cache(self, response_generator):
+        cached_data = [
+            TestExecution(
+                id="test1",
+                name="test_cached",
+                type="TEST",
+                startTime=1640000000000,
+                endTime=1640000060000,
+                status="PASSED",
+                launchId="launch1",
+                attributes={},
+                tags=[],
+            )
+        ]
+
+        async def mock_stream(*args, **kwargs):
+            yield "Found cached test result"
+
+        response_generator.cache_manager.get = MagicMock(return_value=cached_data)
+        response_generator._fetch_relevant_data = AsyncMock()
+        response_generator.llm_interface.generate_streaming_response = mock_stream
+
+        metadata = {}
+        chunks = [
+            chunk
+            async for chunk in response_generator.generate_streaming_response(
+                "Show test_cached status", metadata=metadata
+            )
+        ]
+
+        assert chunks == ["Found cached test result"]
+        response_generator._fetch_relevant_data.assert_not_called()
+        response_generator.cache_manager.aset.assert_not_called()
+        assert metadata["data_points"] == 1
+        assert "statistics" in metadata
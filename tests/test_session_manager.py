@@ -0,0 +1,72 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from src.application.session_manager import SessionManager
+
+
+@pytest.fixture
+def session_manager(test_config):
+    return SessionManager(test_config)
+
+
+def reload(test_config, session_id):
+    """Read a session back through a fresh manager with nothing in memory."""
+    return SessionManager(test_config).get_session_history(session_id)
+
+
+class TestSessionManager:
+    def test_appended_history_is_reloaded(self, session_manager, test_config):
+        session_id = session_manager.create_session()
+        session_manager.add_to_history(session_id, "q1", "r1")
+        session_manager.add_to_history(session_id, "q2", "r2", {"count": 2})
+
+        history = reload(test_config, session_id)
+
+        assert [entry["query"] for entry in history] == ["q1", "q2"]
+        assert history[-1]["metadata"] == {"count": 2}
+
+    def test_history_is_reloaded_after_compaction(self, session_manager, test_config):
+        session_manager.max_history_length = 2
+        session_id = session_manager.create_session()
+        for i in range(3):
+            session_manager.add_to_history(session_id, f"q{i}", f"r{i}")
+
+        session_manager.close_session(session_id)
+
+        # Compaction rewrites the log with only the entries still in the deque
+        history_file = session_manager.session_dir / f"{session_id}.jsonl"
+        assert len(history_file.read_bytes().splitlines()) == 2
+
+        history = reload(test_config, session_id)
+        assert [entry["query"] for entry in history] == ["q1", "q2"]
+
+        session = SessionManager(test_config)._load_session(session_id)
+        assert session["created_at"] <= session["last_active"]
+
+    def test_baseline_session_file_is_read(self, session_manager, test_config):
+        # Sessions written before the JSONL log were a single file with inline history
+        session_file = session_manager.session_dir / "legacy.json"
+        session_file.write_text(
+            json.dumps(
+                {
+                    "created_at": "2024-01-15T10:00:00",
+                    "last_active": "2024-01-15T10:05:00",
+                    "history": [
+                        {
+                            "timestamp": "2024-01-15T10:05:00",
+                            "query": "legacy query",
+                            "response": "legacy response",
+                            "metadata": None,
+                        }
+                    ],
+                }
+            )
+        )
+
+        session = SessionManager(test_config)._load_session("legacy")
+
+        assert session["created_at"] == datetime(2024, 1, 15, 10, 0)
+        assert session["last_active"] == datetime(2024, 1, 15, 10, 5)
+        assert [entry["query"] for entry in session["history"]] == ["legacy query"]
@@ -5,9 +5,9 @@ import pytest
 from src.utils.validators import (
     DateTimeValidator,
     PlatformValidator,
+    QueryError,
     QueryValidator,
     StatusValidator,
-    TestNameValidator,
     URLValidator,
     sanitize_string,
 )
@@ -25,6 +25,8 @@ class TestURLValidator:
         for url in valid_urls:
             assert URLValidator.validate_url(url) is True
 
+        assert URLValidator.validate_urls(valid_urls) == [True] * len(valid_urls)
+
     def test_invalid_urls(self):
         invalid_urls = [
             "not-a-url",
@@ -36,6 +38,8 @@ class TestURLValidator:
         for url in invalid_urls:
             assert URLValidator.validate_url(url) is False
 
+        assert URLValidator.validate_urls(invalid_urls) == [False] * len(invalid_urls)
+
     def test_normalize_url(self):
         assert URLValidator.normalize_url("example.com") == "http://example.com"
         assert URLValidator.normalize_url("http://example.com/") == "http://example.com"
@@ -58,16 +62,19 @@ class TestQueryValidator:
         # Empty query
         is_valid, error = QueryValidator.validate_query("")
         assert is_valid is False
+        assert error is QueryError.EMPTY
         assert "empty" in error
 
         # Too short
         is_valid, error = QueryValidator.validate_query("a")
         assert is_valid is False
+        assert error is QueryError.TOO_SHORT
         assert "short" in error
 
         # Too long
         is_valid, error = QueryValidator.validate_query("x" * 1001)
         assert is_valid is False
+        assert error is QueryError.TOO_LONG
         assert "long" in error
 
 
@@ -102,6 +109,13 @@ class TestPlatformValidator:
         assert PlatformValidator.normalize_platform("google") == "gcp"
         assert PlatformValidator.normalize_platform("invalid") is None
 
+    def test_normalize_platforms(self):
+        assert PlatformValidator.normalize_platforms(["AWS", "google", "invalid"]) == [
+            "aws",
+            "gcp",
+            None,
+        ]
+
     def test_is_valid_platform(self):
         assert PlatformValidator.is_valid_platform("aws") is True
         assert PlatformValidator.is_valid_platform("Azure") is True
@@ -0,0 +1,71 @@
+import logging
+from logging.handlers import TimedRotatingFileHandler
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.application.web_interface import app
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager, so the lifespan (which loads the real
+    # config and builds the response generator) does not run
+    return TestClient(app)
+
+
+class TestServeUI:
+    def test_ui_is_served_with_etag(self, client):
+        response = client.get("/ui")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/html")
+        assert response.headers["etag"]
+        assert b"<html>" in response.content
+
+    def test_matching_etag_returns_not_modified(self, client):
+        etag = client.get("/ui").headers["etag"]
+
+        response = client.get("/ui", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+
+    def test_stale_etag_returns_full_page(self, client):
+        response = client.get("/ui", headers={"If-None-Match": '"stale"'})
+
+        assert response.status_code == 200
+        assert response.content
+
+
+class TestLifespan:
+    @pytest.fixture
+    def restore_logging(self):
+        root = logging.getLogger()
+        saved_handlers, saved_level = root.handlers[:], root.level
+        app_logger = logging.getLogger("src")
+        saved_app_level = app_logger.level
+        yield
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+        app_logger.setLevel(saved_app_level)
+
+    def test_startup_configures_logging(self, test_config, restore_logging):
+        with patch("src.application.web_interface.Config.from_yaml", return_value=test_config):
+            with TestClient(app):
+                log_files = {
+                    Path(handler.baseFilename).name
+                    for handler in logging.getLogger().handlers
+                    if isinstance(handler, TimedRotatingFileHandler)
+                    and Path(handler.baseFilename).parent == Path(test_config.paths.logs_dir)
+                }
+
+        assert log_files == {"app.log", "errors.log"}
+        assert logging.getLogger("src.application.web_interface").isEnabledFor(logging.INFO)